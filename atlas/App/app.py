@@ -1,11 +1,271 @@
+# ATLAS web app + ingest API
+#
+#   python app.py                                   (dev: Flask server and hub in one process)
+#   python app.py --hub                             (hub: runway plan + dashboard WebSocket on :6789)
+#   gunicorn -w 4 --threads 8 -b 0.0.0.0:5000 app:app
+#
+# Web workers only parse and validate; each accepted batch is sent over the
+# event bus (Backend/event_bus.py, address from $ATLAS_BUS) to the hub, which
+# owns the one runway plan and the dashboard broadcaster. Any number of
+# workers can feed it. The hub answers each batch, so a request gets 503 when
+# the hub is down, slow or its backlog is full; request threads never block.
+# The plan runs on $ATLAS_AIRPORT from $ATLAS_AIRPORTS (default: the first
+# airport in runway_allocator/airports.json).
+
+import argparse
+import json
+import os
+import queue
+import sys
+import threading
+
 from flask import Flask, request, jsonify
 
+ATLAS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ATLAS_DIR, "runway_allocator"))
+sys.path.insert(0, os.path.join(ATLAS_DIR, "Backend"))
+
+from event_bus import DEFAULT_ADDRESS, EventBus, IngestBatch, Rejected, connect
+from event_bus import run_hub as run_bus_hub
+from notifier import notify_alert
+from resequencer import Resequencer
+from scheduler import SIZE_RANK, RunwayScheduler
+from topology import DEFAULT_CONFIG, load_topology
+
+MAX_BATCH = 5000        # records per request
+INGEST_BACKLOG = 1000   # batches waiting for the scheduler before requests get 503
+LEVELS = ("info", "warning", "critical")
+BUS_ADDRESS = os.environ.get("ATLAS_BUS") or DEFAULT_ADDRESS
+AIRPORTS = os.environ.get("ATLAS_AIRPORTS") or DEFAULT_CONFIG
+AIRPORT = os.environ.get("ATLAS_AIRPORT")  # default: first airport in AIRPORTS
+
+# Compact schema: field -> (accepted types, required for a new record)
+FLIGHT_FIELDS = {
+    "id": ((int, str), True),
+    "type": ((str,), True),
+    "fuel_level": ((int, float), True),
+    "emergency": ((bool,), True),
+    "eta": ((str,), True),
+    "required_runway_length": ((int, float), False),
+}
+ALERT_FIELDS = {
+    "module": ((str,), True),
+    "message": ((str,), True),
+    "level": ((str,), False),
+    "station": ((str,), False),
+}
+
 app = Flask(__name__)
 
+
+def _check(record, fields, partial=False):
+    """Error string for ``record`` against ``fields``, or None if it is valid."""
+    for name, (types, required) in fields.items():
+        if name not in record:
+            if required and not partial:
+                return f"missing '{name}'"
+            continue
+        value = record[name]
+        if not isinstance(value, types) or (isinstance(value, bool) and bool not in types):
+            return f"'{name}' must be {' or '.join(t.__name__ for t in types)}"
+    unknown = set(record) - set(fields) - {"kind"}
+    if unknown:
+        return f"unknown field(s): {', '.join(sorted(unknown))}"
+    return None
+
+
+def validate(record):
+    """Returns an error string, or None if ``record`` is a valid flight, removal or alert."""
+    if not isinstance(record, dict):
+        return "record must be an object"
+    kind = record.get("kind", "flight")
+    if kind == "flight":
+        if "id" not in record:
+            return "missing 'id'"
+        error = _check(record, FLIGHT_FIELDS, partial=True)  # known flights may send just the changes
+        if error is None and "type" in record and record["type"] not in SIZE_RANK:
+            error = f"'type' must be one of {', '.join(SIZE_RANK)}"
+        return error
+    if kind == "remove":
+        return None if isinstance(record.get("id"), (int, str)) else "missing 'id'"
+    if kind == "alert":
+        error = _check(record, ALERT_FIELDS)
+        if error is None and record.get("level", "info") not in LEVELS:
+            error = f"'level' must be one of {', '.join(LEVELS)}"
+        return error
+    return f"unknown kind {kind!r}"
+
+
+def parse_body(data, content_type):
+    """JSON array/object or NDJSON -> list of records; raises ValueError."""
+    if "ndjson" in content_type or "jsonl" in content_type:
+        return [json.loads(line) for line in data.splitlines() if line.strip()]
+    body = json.loads(data)
+    return body if isinstance(body, list) else [body]
+
+
+class IngestWorker:
+    """Applies ingested batches to the runway plan; runs in the hub process only.
+
+    The worker drains every batch waiting, applies them to one
+    ``Resequencer`` over the configured airport (``AIRPORTS``/``AIRPORT``),
+    re-plans once and notifies dashboards of the assignments that changed.
+    A failing record or re-plan is logged and counted, never fatal.
+    """
+
+    def __init__(self, backlog=INGEST_BACKLOG, topology=None):
+        if topology is None:
+            topology = load_topology(AIRPORTS, AIRPORT)
+        self.batches = queue.Queue(backlog)
+        self.resequencer = Resequencer(RunwayScheduler.from_topology(topology))
+        self.published = {}  # flight id -> (runway, start) last sent to dashboards
+        self.errors = 0
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        # Started on first use rather than at import, so web workers never start one
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="ingest", daemon=True)
+                self._thread.start()
+
+    def submit(self, records):
+        self.start()
+        self.batches.put_nowait(records)  # raises queue.Full when the scheduler is behind
+
+    def _run(self):
+        while True:
+            records = self.batches.get()
+            try:
+                while True:  # fold in everything else that is waiting
+                    records.extend(self.batches.get_nowait())
+            except queue.Empty:
+                pass
+            self._process(records)
+
+    def _process(self, records):
+        flights_changed = False
+        for record in records:
+            try:
+                flights_changed |= self._apply(record)
+            except Exception as e:  # one bad record must not stop the worker thread
+                self.errors += 1
+                print(f"ingest: skipped {record!r}: {e!r}")
+        if flights_changed:
+            try:
+                self._publish_plan()
+            except Exception as e:
+                self.errors += 1
+                print(f"ingest: re-plan failed: {e!r}")
+
+    def _apply(self, record):
+        kind = record.pop("kind", "flight")
+        if kind == "alert":
+            notify_alert(record.pop("module"), record.pop("message"), record.pop("level", "info"),
+                         station=record.pop("station", None))
+            return False
+        flight_id = record["id"]
+        if kind == "remove":
+            if flight_id in self.resequencer:
+                self.resequencer.remove(flight_id)
+                self.published.pop(flight_id, None)
+                # Tombstone under the flight's key, so dashboards and the state snapshot drop it
+                notify_alert("runway", f"Flight {flight_id} removed", key=flight_id, flight=flight_id, removed=True)
+            return True
+        if flight_id in self.resequencer:
+            changes = {k: v for k, v in record.items() if k != "id"}
+            self.resequencer.update(flight_id, **changes)
+        else:
+            missing = [name for name, (_, required) in FLIGHT_FIELDS.items() if required and name not in record]
+            if missing:
+                raise KeyError(f"new flight is missing {', '.join(missing)}")
+            self.resequencer.add(record)
+        return True
+
+    def _publish_plan(self):
+        for entry in self.resequencer.log_entries:
+            flight_id = entry["Flight ID"]
+            assignment = (entry["Assigned Runway"], entry["Start Time"])
+            if self.published.get(flight_id) != assignment:
+                self.published[flight_id] = assignment
+                notify_alert("runway", f"Flight {flight_id} -> {assignment[0]} at t={assignment[1]}",
+                             key=flight_id, flight=flight_id, runway=assignment[0],
+                             start=entry["Start Time"], end=entry["End Time"])
+
+
+ingest_worker = IngestWorker()
+_hub = None
+_hub_lock = threading.Lock()
+
+
+def _accept_batch(event):
+    try:
+        ingest_worker.submit(event.records)
+    except queue.Full:
+        raise Rejected("ingest backlog full") from None  # answered to the web worker, which returns 503
+
+
+def hub_bus():
+    """Hub-side bus: batches forwarded by the web workers go to ``ingest_worker``."""
+    bus = EventBus()
+    bus.subscribe(IngestBatch, _accept_batch)
+    return bus
+
+
+def run_hub(host="localhost", port=6789):
+    run_bus_hub(BUS_ADDRESS, host, port, bus=hub_bus())
+
+
+def forward(records):
+    """Hands a validated batch to the hub; raises Rejected (backlog full) or ConnectionError."""
+    global _hub
+    if _hub is None:
+        with _hub_lock:  # request threads race here on a worker's first requests
+            if _hub is None:
+                _hub = connect(BUS_ADDRESS)
+    _hub.send(IngestBatch(records))
+
+
 @app.route('/api/test', methods=['POST'])
 def testapi():
     data = request.get_json()
     print(data)
     return data
+
+@app.route('/api/ingest', methods=['POST'])
+def ingest():
+    """Batched flight updates and alerts, as a JSON array or NDJSON (one record per line)."""
+    try:
+        records = parse_body(request.get_data(), request.content_type or "")
+    except ValueError as e:
+        return jsonify({"error": f"invalid JSON: {e}"}), 400
+    if len(records) > MAX_BATCH:
+        return jsonify({"error": f"at most {MAX_BATCH} records per request"}), 413
+
+    accepted, rejected = [], []
+    for index, record in enumerate(records):
+        error = validate(record)
+        if error is None:
+            accepted.append(record)
+        else:
+            rejected.append({"index": index, "error": error})
+
+    if accepted:
+        try:
+            forward(accepted)
+        except Rejected:
+            return jsonify({"error": "ingest backlog full, retry shortly"}), 503, {"Retry-After": "1"}
+        except ConnectionError:
+            return jsonify({"error": "ingest hub unavailable, retry shortly"}), 503, {"Retry-After": "5"}
+    return jsonify({"accepted": len(accepted), "rejected": rejected}), 202
+
 if __name__=='__main__':
-    app.run(debug=True)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="ATLAS web app and ingest API")
+    parser.add_argument("--hub", action="store_true", help="run only the hub that gunicorn workers forward to")
+    args = parser.parse_args()
+    if args.hub:
+        run_hub()
+    else:
+        threading.Thread(target=run_hub, name="hub", daemon=True).start()
+        app.run(debug=True, use_reloader=False)
@@ -0,0 +1,134 @@
+import os
+import subprocess
+import sys
+import threading
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_app_imports_from_a_clean_interpreter():
+    # A fresh process, so nothing already on sys.path can hide a bad import
+    subprocess.run([sys.executable, "-c", "import app"], cwd=APP_DIR, check=True)
+
+
+def test_ingest_rejects_bad_records_by_index():
+    import app
+
+    client = app.app.test_client()
+    response = client.post("/api/ingest", json=[{"kind": "alert", "module": "comms"}, {"id": 1, "fuel_level": "x"}])
+    assert response.status_code == 202
+    assert response.get_json() == {
+        "accepted": 0,
+        "rejected": [{"index": 0, "error": "missing 'message'"},
+                     {"index": 1, "error": "'fuel_level' must be int or float"}],
+    }
+
+
+def test_ingest_rejects_invalid_json():
+    import app
+
+    response = app.app.test_client().post("/api/ingest", data="{bad", content_type="application/json")
+    assert response.status_code == 400
+
+
+def test_ingest_reaches_the_hub_plan(tmp_path, monkeypatch):
+    import app
+    from event_bus import connect, serve_bus
+
+    monkeypatch.setenv("ATLAS_BUS_KEY", "test-key")
+    sent = []
+    done = threading.Event()
+
+    def notify(module, message, level="info", **data):
+        sent.append(data)
+        if len(sent) == 2:
+            done.set()
+
+    monkeypatch.setattr(app, "notify_alert", notify)
+    address = str(tmp_path / "bus.sock")
+    listener = serve_bus(app.hub_bus(), address)
+    monkeypatch.setattr(app, "_hub", connect(address))
+    try:
+        flights = [{"id": i, "type": "Small", "eta": "12:00", "fuel_level": 50, "emergency": False}
+                   for i in (1, 2)]
+        response = app.app.test_client().post("/api/ingest", json=flights)
+        assert response.status_code == 202
+        assert done.wait(5)
+    finally:
+        listener.close()
+    assert sorted(data["flight"] for data in sent) == [1, 2]
+
+
+def test_ingest_without_a_hub_is_unavailable(tmp_path, monkeypatch):
+    import app
+    from event_bus import connect
+
+    monkeypatch.setenv("ATLAS_BUS_KEY", "test-key")
+    monkeypatch.setattr(app, "_hub", connect(str(tmp_path / "missing.sock")))
+    response = app.app.test_client().post("/api/ingest", json=[{"kind": "alert", "module": "comms", "message": "x"}])
+    assert response.status_code == 503
+
+
+def test_removed_flight_leaves_the_dashboard_state(monkeypatch):
+    import app
+    from state_store import StateStore
+
+    store = StateStore()
+    monkeypatch.setattr(app, "notify_alert",
+                        lambda module, message, level="info", key=None, **data:
+                        store.record({"module": module, "message": message, **data}, ("runway", None, key)))
+    worker = app.IngestWorker()
+    for record in ({"id": 7, "type": "Small", "eta": "12:00", "fuel_level": 50, "emergency": False},
+                   {"kind": "remove", "id": 7}):
+        if worker._apply(record):
+            worker._publish_plan()
+    assert [e.get("removed") for e in store.events] == [None, True]
+    assert store.snapshot()["state"] == []
+
+
+def test_full_backlog_answers_503_without_blocking(tmp_path, monkeypatch):
+    import app
+    from event_bus import connect, serve_bus
+
+    monkeypatch.setenv("ATLAS_BUS_KEY", "test-key")
+    worker = app.IngestWorker(backlog=1)
+    monkeypatch.setattr(worker, "start", lambda: None)  # nothing drains: the backlog stays full
+    monkeypatch.setattr(app, "ingest_worker", worker)
+    address = str(tmp_path / "bus.sock")
+    listener = serve_bus(app.hub_bus(), address)
+    monkeypatch.setattr(app, "_hub", connect(address))
+    try:
+        client = app.app.test_client()
+        alert = [{"kind": "alert", "module": "comms", "message": "x"}]
+        assert client.post("/api/ingest", json=alert).status_code == 202
+        response = client.post("/api/ingest", json=alert)
+        assert response.status_code == 503 and response.headers["Retry-After"] == "1"
+    finally:
+        listener.close()
+
+
+def test_worker_survives_a_failing_record_and_plan(monkeypatch):
+    import app
+
+    sent = []
+    monkeypatch.setattr(app, "notify_alert", lambda *args, **data: sent.append(data))
+    worker = app.IngestWorker()
+    flight = {"id": 1, "type": "Small", "eta": "12:00", "fuel_level": 50, "emergency": False}
+    worker.resequencer.add = lambda record: 1 / 0
+    worker._process([dict(flight)])
+    del worker.resequencer.add
+    worker._publish_plan = lambda: [][0]
+    worker._process([dict(flight)])
+    assert worker.errors == 2 and not sent
+    del worker._publish_plan
+    worker._process([{"id": 1, "fuel_level": 40}])
+    assert [data["flight"] for data in sent] == [1]
+
+
+def test_worker_plans_on_the_configured_airport():
+    import app
+    from topology import load_topology
+
+    topology = load_topology(app.AIRPORTS, "DEMO_CROSSING")
+    worker = app.IngestWorker(topology=topology)
+    assert worker.resequencer.scheduler.runways == topology.runways
@@ -0,0 +1,385 @@
+# backend/event_bus.py
+#
+# Typed publish/subscribe between the fatigue, runway and comms modules.
+# In one process, subscribers get the published object itself (no copies,
+# no serialisation). Producers in other processes forward their events to a
+# hub over a Unix socket (a named pipe on Windows); the hub republishes them
+# on its own bus, which is bridged to the dashboard broadcaster. Connections
+# are authenticated with a shared key: $ATLAS_BUS_KEY, or the key file the
+# hub creates (mode 0600) in the per-user runtime directory.
+#
+#   python event_bus.py                                (hub + WebSocket server)
+#   python fatigue_detection.py --bus                  (producer)
+import getpass
+import os
+import queue
+import secrets
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+
+RUNTIME_DIR = os.path.join(os.environ["XDG_RUNTIME_DIR"], "atlas") if os.environ.get("XDG_RUNTIME_DIR") \
+    else os.path.join(os.path.expanduser("~"), ".atlas", "run")
+if sys.platform == "win32":
+    DEFAULT_ADDRESS = rf"\\.\pipe\atlas-bus-{getpass.getuser()}"
+else:
+    DEFAULT_ADDRESS = os.path.join(RUNTIME_DIR, "bus.sock")
+KEY_ENV = "ATLAS_BUS_KEY"
+KEY_FILE = os.path.join(RUNTIME_DIR, "bus.key")
+
+FORWARD_QUEUE = 10000   # events buffered per producer while the hub is slow or away
+RECONNECT_DELAY = 1.0
+SEND_TIMEOUT = 5.0      # seconds RemoteBus.send waits for the hub to take an event
+DISTRESS_WORDS = ("mayday", "pan-pan", "emergency")
+
+
+# ----------- Events -----------
+class Event:
+    """Base class: subscribing to Event receives every event."""
+
+
+@dataclass(frozen=True)
+class FatigueScore(Event):
+    station: str
+    level: int
+    ear: float = None
+    mar: float = None
+    face_touched: bool = False
+    timestamp: float = field(default_factory=time.time)
+
+
+@dataclass(frozen=True)
+class RunwayAssignment(Event):
+    flight_id: object
+    aircraft_type: str
+    runway: str
+    start: float
+    end: float
+    emergency: bool = False
+    timestamp: float = field(default_factory=time.time)
+
+
+@dataclass(frozen=True)
+class CommsAlert(Event):
+    source: str
+    text: str
+    triggers: list = field(default_factory=list)
+    entities: list = field(default_factory=list)
+    phrases: list = field(default_factory=list)
+    critical: bool = False
+    timestamp: float = field(default_factory=time.time)
+
+
+@dataclass(frozen=True)
+class IngestBatch(Event):
+    """Validated /api/ingest records, forwarded by a web worker to the hub that owns the runway plan."""
+    records: list
+    timestamp: float = field(default_factory=time.time)
+
+
+class Rejected(Exception):
+    """Raised by a handler to refuse an event; reaches the publisher (or the sender in ``RemoteBus.send``)."""
+
+
+@dataclass(frozen=True)
+class _Request:
+    # An event sent with RemoteBus.send: the hub answers None (handled) or the rejection message
+    event: Event
+
+
+# ----------- Key -----------
+def load_authkey(create=False):
+    """Shared secret for the bus socket: $ATLAS_BUS_KEY, else KEY_FILE (generated by the hub if ``create``)."""
+    key = os.environ.get(KEY_ENV)
+    if key:
+        return key.encode()
+    try:
+        fd = os.open(KEY_FILE, os.O_RDONLY)
+    except FileNotFoundError:
+        if not create:
+            raise FileNotFoundError(f"no event bus key in {KEY_FILE}: start the hub first or set {KEY_ENV}")
+        os.makedirs(RUNTIME_DIR, mode=0o700, exist_ok=True)
+        try:
+            fd = os.open(KEY_FILE, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            return load_authkey()  # another hub created it first
+        key = secrets.token_hex(32).encode()
+        with os.fdopen(fd, "wb") as f:
+            f.write(key)
+        return key
+    with os.fdopen(fd, "rb") as f:
+        if sys.platform != "win32":
+            stat = os.fstat(f.fileno())
+            if stat.st_uid != os.getuid() or stat.st_mode & 0o077:
+                raise PermissionError(f"{KEY_FILE} must be owned by you with mode 0600")
+        return f.read().strip()
+
+
+# ----------- Bus -----------
+class EventBus:
+    """Synchronous in-process pub/sub keyed by event type.
+
+    ``publish`` hands the event object to every handler subscribed to its
+    type or a base class, on the publishing thread. Handler tuples are
+    replaced on subscribe, so publishing takes no lock. A handler that
+    raises ``Rejected`` stops the delivery and the publisher gets the error;
+    any other exception is logged and skipped.
+    """
+
+    def __init__(self):
+        self._handlers = {}   # event type -> handlers subscribed to exactly that type
+        self._dispatch = {}   # concrete type -> handlers for it and its bases
+        self._lock = threading.Lock()
+
+    def subscribe(self, event_type, handler):
+        """Returns a function that removes the subscription."""
+        with self._lock:
+            self._handlers[event_type] = self._handlers.get(event_type, ()) + (handler,)
+            self._dispatch = {}
+
+        def unsubscribe():
+            with self._lock:
+                self._handlers[event_type] = tuple(h for h in self._handlers.get(event_type, ()) if h is not handler)
+                self._dispatch = {}
+
+        return unsubscribe
+
+    def _handlers_for(self, event_type):
+        # Fill the cache we read from: if a (un)subscribe replaces it while the
+        # handlers are being collected, the possibly stale tuple goes into the
+        # discarded dict, never into the fresh one.
+        dispatch = self._dispatch
+        handlers = dispatch.get(event_type)
+        if handlers is None:
+            handlers = tuple(h for cls in event_type.__mro__ for h in self._handlers.get(cls, ()))
+            dispatch[event_type] = handlers
+        return handlers
+
+    def publish(self, event):
+        for handler in self._handlers_for(type(event)):
+            try:
+                handler(event)
+            except Rejected:
+                raise
+            except Exception as e:  # a broken subscriber must not take the producer down
+                print(f"event bus: {handler!r} failed on {type(event).__name__}: {e!r}")
+
+
+class RemoteBus(EventBus):
+    """Producer-side bus: local subscribers as usual, and every event forwarded to a hub.
+
+    Forwarding happens on a background thread; ``publish`` only enqueues,
+    and drops the event (counting it in ``dropped``) if the hub is too far
+    behind or unreachable. Without an ``authkey`` the key is loaded (see
+    ``load_authkey``) on each connection attempt, so producers may start
+    before the hub.
+    """
+
+    def __init__(self, address=DEFAULT_ADDRESS, authkey=None, queue_size=FORWARD_QUEUE):
+        super().__init__()
+        self.address = address
+        self.authkey = authkey
+        self.dropped = 0
+        self._outbox = queue.Queue(queue_size)
+        self._local = threading.local()
+        threading.Thread(target=self._forward, name="event-bus-forward", daemon=True).start()
+
+    def publish(self, event):
+        super().publish(event)
+        try:
+            self._outbox.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+
+    def send(self, event, timeout=SEND_TIMEOUT):
+        """Delivers ``event`` on the calling thread and waits for the hub to handle it.
+
+        Bypasses the queue and local subscribers, for callers that must
+        report the outcome: raises ``Rejected`` if a hub handler refused the
+        event, and ConnectionError if the hub is unreachable or has not
+        answered within ``timeout`` s. Each thread keeps its own connection.
+        """
+        request = _Request(event)
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            try:
+                conn.send(request)
+            except OSError:
+                conn.close()
+                conn = None  # hub restarted: reconnect once
+        try:
+            if conn is None:
+                conn = Client(self.address, authkey=self.authkey or load_authkey())
+                conn.send(request)
+            self._local.conn = conn
+            if not conn.poll(timeout):
+                raise TimeoutError(f"no answer within {timeout} s")
+            reply = conn.recv()
+        except (OSError, EOFError, AuthenticationError) as e:
+            if conn is not None:
+                conn.close()  # a late answer must not be read as the next one's
+            self._local.conn = None
+            raise ConnectionError(f"event hub unreachable at {self.address}: {e!r}") from e
+        if reply is not None:
+            raise Rejected(reply)
+
+    def flush(self, timeout=5.0):
+        """Waits (up to ``timeout`` s) for queued events to reach the hub; call before exiting."""
+        deadline = time.monotonic() + timeout
+        while self._outbox.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def _forward(self):
+        conn = None
+        while True:
+            event = self._outbox.get()
+            try:
+                if conn is None:
+                    conn = Client(self.address, authkey=self.authkey or load_authkey())
+                conn.send(event)
+            except (OSError, EOFError, AuthenticationError):
+                conn = None
+                self.dropped += 1
+                time.sleep(RECONNECT_DELAY)
+            finally:
+                self._outbox.task_done()
+
+
+def serve_bus(bus, address=DEFAULT_ADDRESS, authkey=None):
+    """Accepts producer connections and republishes their events on ``bus``; returns the Listener.
+
+    Only peers holding ``authkey`` (default: ``load_authkey(create=True)``)
+    are accepted, since received events are unpickled.
+    """
+    if authkey is None:
+        authkey = load_authkey(create=True)
+    if address == DEFAULT_ADDRESS and not address.startswith("\\\\"):
+        os.makedirs(RUNTIME_DIR, mode=0o700, exist_ok=True)
+    if not address.startswith("\\\\") and os.path.exists(address):
+        os.remove(address)  # stale socket from a previous hub
+    listener = Listener(address, authkey=authkey)
+
+    def receive(conn):
+        with conn:
+            while True:
+                try:
+                    message = conn.recv()
+                except (EOFError, OSError):
+                    return
+                request = isinstance(message, _Request)
+                try:
+                    bus.publish(message.event if request else message)
+                    reply = None
+                except Rejected as e:
+                    reply = str(e) or "rejected"
+                if request:
+                    try:
+                        conn.send(reply)
+                    except OSError:
+                        return
+
+    def accept():
+        while True:
+            try:
+                conn = listener.accept()
+            except (AuthenticationError, EOFError, ConnectionError):
+                continue  # wrong key, or the peer left mid-handshake
+            except OSError:
+                return  # listener closed
+            threading.Thread(target=receive, args=(conn,), name="event-bus-recv", daemon=True).start()
+
+    threading.Thread(target=accept, name="event-bus-accept", daemon=True).start()
+    return listener
+
+
+# ----------- Producers -----------
+# Each returns the callable a module's hook expects (FatigueMonitor.on_reading,
+# RunwayScheduler.on_assign, TranscriptionService.on_analysis).
+def fatigue_publisher(bus, station):
+    def publish(reading):
+        bus.publish(FatigueScore(station=station, level=reading["fatigue_level"], ear=reading["ear"],
+                                 mar=reading["mar"], face_touched=reading["face_touched"]))
+    return publish
+
+
+def runway_publisher(bus):
+    def publish(log_entry):
+        bus.publish(RunwayAssignment(flight_id=log_entry["Flight ID"], aircraft_type=log_entry["Type"],
+                                     runway=log_entry["Assigned Runway"], start=log_entry["Start Time"],
+                                     end=log_entry["End Time"], emergency=log_entry["Emergency"]))
+    return publish
+
+
+def comms_publisher(bus, source="radio"):
+    def publish(result):
+        if result["alert"]:
+            bus.publish(CommsAlert(source=source, text=result["text"], triggers=result["triggers"],
+                                   entities=result["entities"], phrases=result["phrases"],
+                                   critical=any(w in result["text"].lower() for w in DISTRESS_WORDS)))
+    return publish
+
+
+def connect(address=None, authkey=None):
+    """Bus for a producer process: forwards to the hub at ``address`` (default socket if None)."""
+    return RemoteBus(address or DEFAULT_ADDRESS, authkey)
+
+
+def add_bus_argument(parser, what):
+    """Adds the producers' ``--bus [ADDRESS]`` option, publishing ``what`` to the hub."""
+    parser.add_argument("--bus", nargs="?", const="", metavar="ADDRESS",
+                        help=f"publish {what} to the event hub (default socket if no address)")
+
+
+def connect_from_args(args):
+    """Bus for the ``--bus`` option, or None if it was not given."""
+    return None if args.bus is None else connect(args.bus)
+
+
+# ----------- Dashboard bridge -----------
+def _fatigue_alert_level(level):
+    return "critical" if level >= 4 else "warning" if level >= 2 else "info"
+
+
+def bridge_to_broadcaster(bus, notify=None):
+    """Sends bus events to the WebSocket dashboards (fatigue and runway state coalesced per key)."""
+    if notify is None:
+        from notifier import notify_alert as notify
+
+    bus.subscribe(FatigueScore, lambda e: notify(
+        "fatigue", f"Fatigue level {e.level}", _fatigue_alert_level(e.level), station=e.station,
+        key="fatigue_level", fatigue_level=e.level, ear=e.ear, mar=e.mar, time=e.timestamp))
+    bus.subscribe(RunwayAssignment, lambda e: notify(
+        "runway", f"Flight {e.flight_id} -> {e.runway} at t={e.start}", "warning" if e.emergency else "info",
+        key=e.flight_id, flight=e.flight_id, runway=e.runway, start=e.start, end=e.end, time=e.timestamp))
+    bus.subscribe(CommsAlert, lambda e: notify(
+        "comms", e.text, "critical" if e.critical else "warning", station=e.source,
+        triggers=e.triggers, phrases=e.phrases, time=e.timestamp))
+
+
+def run_hub(address=DEFAULT_ADDRESS, host="localhost", port=6789, bus=None):
+    """Serves producers on ``address`` and dashboards on ``host``:``port``; blocks."""
+    from run_server import run_server
+
+    if bus is None:
+        bus = EventBus()
+    bridge_to_broadcaster(bus)
+    serve_bus(bus, address)
+    print(f"Event bus listening on {address}, dashboards on ws://{host}:{port}")
+    run_server(host, port)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="ATLAS event hub: producer bus -> dashboard WebSocket")
+    parser.add_argument("--address", default=DEFAULT_ADDRESS, help="Unix socket path / named pipe for producers")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=6789)
+    args = parser.parse_args()
+
+    # Re-import under the module name so the event classes match the ones producers pickle
+    from event_bus import run_hub as module_run_hub
+    module_run_hub(args.address, args.host, args.port)
@@ -1,19 +1,273 @@
 # backend/notifier.py
 import asyncio
 import json
+from state_store import StateStore
 
-clients = set()
+QUEUE_SIZE = 100      # messages buffered per dashboard before the oldest are dropped
+SEND_TIMEOUT = 10.0   # a dashboard that can't take one message in this long is disconnected
+COALESCE_INTERVAL = 0.5  # keyed alerts (e.g. per-frame fatigue) go out at most this often per key
+SNAPSHOT_CACHE = 32   # serialised snapshots kept per seq (one per distinct filter set)
+
+FILTER_FIELDS = {"modules": "module", "levels": "level", "stations": "station"}
+
+
+def _filter_error(filters):
+    """Why a ``subscribe`` request is malformed, or None."""
+    for name in FILTER_FIELDS:
+        values = filters.get(name)
+        if values is not None and not (isinstance(values, list) and all(isinstance(v, str) for v in values)):
+            return f"'{name}' must be a list of strings"
+    return None
+
+
+class _Client:
+    __slots__ = ("websocket", "queue", "task", "dropped", "filters", "filter_key")
+
+    def __init__(self, websocket, queue_size):
+        self.websocket = websocket
+        self.queue = asyncio.Queue(queue_size)
+        self.task = None
+        self.dropped = 0
+        self.filters = {}  # field -> allowed values; a missing field allows everything
+        self.filter_key = frozenset()  # hashable form of filters, for the snapshot cache
+
+    def wants(self, alert_data):
+        for field, allowed in self.filters.items():
+            value = alert_data.get(field)
+            if value is not None and value not in allowed:
+                return False
+        return True
+
+
+class Broadcaster:
+    """Fans alerts out to every connected dashboard without letting one stall the rest.
+
+    Each client has a bounded queue drained by its own sender task; when a
+    client falls behind, its oldest queued messages are dropped. Messages are
+    serialised once per broadcast. ``publish_threadsafe`` may be called from
+    any thread once ``attach`` has bound the server's event loop.
+
+    Clients subscribe by sending ``{"subscribe": {"modules": [...],
+    "levels": [...], "stations": [...]}}``; an omitted list means all, and
+    alerts without a station pass a station filter; a malformed request is
+    answered with ``{"type": "error"}`` and changes nothing. Alerts
+    published with a ``key`` are coalesced: each key is sent at most once
+    per ``coalesce_interval`` and always with its latest value.
+
+    Every broadcast carries a ``seq``. On connect a client gets a snapshot
+    (latest event per key plus recent events, and the server ``epoch``); a
+    client that passes the last ``seq`` it saw and that epoch
+    (``?since=N&epoch=E`` or ``{"resume": N, "epoch": E}``) gets only the
+    events it missed, or a snapshot if they are no longer in the ring or
+    the server has restarted since.
+    """
+
+    def __init__(self, queue_size=QUEUE_SIZE, send_timeout=SEND_TIMEOUT, coalesce_interval=COALESCE_INTERVAL):
+        self.queue_size = queue_size
+        self.send_timeout = send_timeout
+        self.coalesce_interval = coalesce_interval
+        self.loop = None
+        self._clients = {}
+        self._last_sent = {}  # key -> loop time of last send, for keys sent within coalesce_interval
+        self._pending = {}    # key -> latest alert waiting for its slot
+        self.store = StateStore()
+        self._snapshots = {}  # filter key -> serialised snapshot at _snapshots_seq
+        self._snapshots_seq = None
+
+    def attach(self, loop):
+        self.loop = loop
+
+    def __len__(self):
+        return len(self._clients)
+
+    def add(self, websocket):
+        client = _Client(websocket, self.queue_size)
+        client.task = asyncio.ensure_future(self._sender(client))
+        self._clients[websocket] = client
+        return client
+
+    def remove(self, websocket):
+        client = self._clients.pop(websocket, None)
+        if client is not None and client.task is not asyncio.current_task():
+            client.task.cancel()
+
+    def _enqueue(self, client, message):
+        try:
+            client.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            client.queue.get_nowait()  # behind: drop the oldest, keep the newest
+            client.dropped += 1
+            client.queue.put_nowait(message)
+
+    def subscribe(self, websocket, filters):
+        """Replaces the client's filters; returns False if ``filters`` was malformed."""
+        client = self._clients.get(websocket)
+        if client is None:
+            return False
+        error = _filter_error(filters)
+        if error is not None:
+            self._enqueue(client, json.dumps({"type": "error", "error": error}))
+            return False
+        client.filters = {field: set(filters[name]) for name, field in FILTER_FIELDS.items()
+                          if filters.get(name) is not None}
+        client.filter_key = frozenset((field, frozenset(values)) for field, values in client.filters.items())
+        self._enqueue(client, json.dumps({"type": "subscribed", **{name: sorted(client.filters[field])
+                                                                  for name, field in FILTER_FIELDS.items()
+                                                                  if field in client.filters}}))
+        return True
+
+    def sync(self, websocket, since=None, epoch=None):
+        """Sends the events after ``since`` if still held, otherwise a full snapshot."""
+        client = self._clients.get(websocket)
+        if client is None:
+            return
+        valid = isinstance(since, int) and not isinstance(since, bool)
+        events = self.store.since(since, epoch) if valid else None
+        if events is None:
+            self._enqueue(client, self._snapshot_message(client))
+            return
+        message = {"type": "deltas", "epoch": self.store.epoch, "seq": self.store.seq,
+                   "events": [e for e in events if client.wants(e)]}
+        self._enqueue(client, json.dumps(message))
+
+    def _snapshot_message(self, client):
+        # Built and serialised once per (seq, filters): a wave of reconnecting dashboards shares it
+        if self._snapshots_seq != self.store.seq:
+            self._snapshots = {}
+            self._snapshots_seq = self.store.seq
+        message = self._snapshots.get(client.filter_key)
+        if message is None:
+            message = json.dumps(self.store.snapshot(client.wants))
+            if len(self._snapshots) < SNAPSHOT_CACHE:
+                self._snapshots[client.filter_key] = message
+        return message
+
+    def handle_message(self, websocket, raw):
+        """Applies a control message from a client; anything unrecognised is ignored."""
+        try:
+            request = json.loads(raw)
+        except (TypeError, ValueError):
+            return
+        if not isinstance(request, dict):
+            return
+        if isinstance(request.get("subscribe"), dict):
+            if self.subscribe(websocket, request["subscribe"]):
+                # state as seen through the new filters
+                self.sync(websocket, request.get("since"), request.get("epoch"))
+        elif "resume" in request:
+            self.sync(websocket, request["resume"], request.get("epoch"))
+
+    def publish(self, alert_data, key=None):
+        """Broadcast from the event loop thread; keyed alerts are rate-limited per key."""
+        if key is None or self.loop is None:
+            self._broadcast(alert_data, key)
+            return
+
+        now = self.loop.time()
+        if key in self._pending:
+            self._pending[key] = alert_data  # a flush is already scheduled: just replace
+        elif now - self._last_sent.get(key, float("-inf")) >= self.coalesce_interval:
+            self._mark_sent(key, now)
+            self._broadcast(alert_data, key)
+        else:
+            self._pending[key] = alert_data
+            self.loop.call_at(self._last_sent[key] + self.coalesce_interval, self._flush, key)
+
+    def _flush(self, key):
+        alert_data = self._pending.pop(key, None)
+        if alert_data is not None:
+            self._mark_sent(key, self.loop.time())
+            self._broadcast(alert_data, key)
+
+    def _mark_sent(self, key, now):
+        self._last_sent[key] = now
+        self.loop.call_at(now + self.coalesce_interval, self._expire, key, now)
+
+    def _expire(self, key, sent_at):
+        # Interval over and nothing newer: forget the key, so only recently active keys are held
+        if self._last_sent.get(key) == sent_at and key not in self._pending:
+            del self._last_sent[key]
+
+    def _broadcast(self, alert_data, key=None):
+        event = self.store.record(alert_data, key)
+        message = None
+        for client in list(self._clients.values()):
+            if client.wants(event):
+                if message is None:
+                    message = json.dumps(event)
+                self._enqueue(client, message)
+
+    def publish_threadsafe(self, alert_data, key=None):
+        if self.loop is None or self.loop.is_closed():
+            return  # server not running: nobody to tell
+        self.loop.call_soon_threadsafe(self.publish, alert_data, key)
+
+    async def _sender(self, client):
+        try:
+            while True:
+                message = await client.queue.get()
+                # Not wait_for: it can swallow a cancel that arrives as the send completes,
+                # leaving the task stuck on the queue when the server shuts down
+                send = asyncio.ensure_future(client.websocket.send(message))
+                try:
+                    await asyncio.wait((send,), timeout=self.send_timeout)
+                finally:
+                    if not send.done():
+                        send.cancel()
+                if send.cancelled():
+                    raise asyncio.TimeoutError("dashboard did not take the message in time")
+                send.result()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.remove(client.websocket)  # dead or stalled socket
+            await client.websocket.close()
+
+
+class _ClientSet:
+    """The old ``clients`` set, backed by the broadcaster."""
+
+    def __init__(self, broadcaster):
+        self._broadcaster = broadcaster
+
+    def add(self, websocket):
+        self._broadcaster.add(websocket)
+
+    def remove(self, websocket):
+        if websocket not in self._broadcaster._clients:
+            raise KeyError(websocket)
+        self._broadcaster.remove(websocket)
+
+    def discard(self, websocket):
+        self._broadcaster.remove(websocket)
+
+    def __contains__(self, websocket):
+        return websocket in self._broadcaster._clients
+
+    def __iter__(self):
+        return iter(list(self._broadcaster._clients))
+
+    def __len__(self):
+        return len(self._broadcaster)
+
+
+broadcaster = Broadcaster()
+clients = _ClientSet(broadcaster)
 
 async def notify_all(alert_data):
-    if clients:
-        message = json.dumps(alert_data)
-        await asyncio.gather(*[client.send(message) for client in clients])
+    broadcaster.publish(alert_data)
 
-def notify_alert(module, message, level="info"):
+def notify_alert(module, message, level="info", station=None, key=None, **data):
+    """Thread-safe. Pass ``key`` for high-rate updates (e.g. per-frame fatigue) to coalesce them."""
     alert_data = {
         "module": module,
         "message": message,
         "level": level
     }
-    loop = asyncio.get_event_loop()
-    loop.create_task(notify_all(alert_data))
+    if station is not None:
+        alert_data["station"] = station
+    alert_data.update(data)
+    if key is not None:
+        alert_data["key"] = key
+        key = (module, station, key)
+    broadcaster.publish_threadsafe(alert_data, key)
@@ -1,19 +1,36 @@
 # backend/run_server.py
 import asyncio
+from urllib.parse import parse_qs, urlsplit
 import websockets
-from backend.notifier import clients
+from notifier import broadcaster, clients
+
+def _resume_point(websocket):
+    """``(since, epoch)`` from the connection URL (``ws://host:6789/?since=42&epoch=...``)."""
+    request = getattr(websocket, "request", None)
+    path = request.path if request is not None else getattr(websocket, "path", "")
+    query = parse_qs(urlsplit(path).query)
+    since = query.get("since", [None])[0]
+    return int(since) if since is not None and since.isdigit() else None, query.get("epoch", [None])[0]
 
 async def handler(websocket):
     clients.add(websocket)
+    broadcaster.sync(websocket, *_resume_point(websocket))
     try:
-        await websocket.wait_closed()
+        async for raw in websocket:  # subscription requests
+            broadcaster.handle_message(websocket, raw)
+    except websockets.ConnectionClosed:
+        pass
     finally:
-        clients.remove(websocket)
+        clients.discard(websocket)
+
+async def serve(host="localhost", port=6789):
+    broadcaster.attach(asyncio.get_running_loop())
+    async with websockets.serve(handler, host, port):
+        await asyncio.Future()  # run until cancelled
 
-def run_server():
-    loop = asyncio.get_event_loop()
-    loop.create_task(websockets.serve(handler, "localhost", 6789))
+def run_server(host="localhost", port=6789):
+    asyncio.run(serve(host, port))
 
-def run_server_in_background():
+def run_server_in_background(host="localhost", port=6789):
     import threading
-    threading.Thread(target=run_server, daemon=True).start()
\ No newline at end of file
+    threading.Thread(target=run_server, args=(host, port), daemon=True).start()
@@ -0,0 +1,74 @@
+# backend/state_store.py
+import uuid
+from collections import OrderedDict, deque
+from itertools import islice
+
+HISTORY = 1000      # recent events kept for resuming clients
+MAX_KEYS = 5000     # latest-state entries (fatigue per station, runway per flight, ...)
+RECENT_IN_SNAPSHOT = 50
+
+
+class StateStore:
+    """Sequence-numbered event log for the alert server.
+
+    Every broadcast event gets the next ``seq``. The store keeps a ring of
+    the last ``history`` events and the latest event per state key, so a
+    new dashboard can start from a snapshot and a reconnecting one can ask
+    for just the events after the last ``seq`` it saw. An event with
+    ``"removed": True`` is a tombstone: it is logged, and its key leaves
+    the latest state.
+
+    ``epoch`` identifies this store instance: seq numbers from another epoch
+    (a previous server run) mean nothing here and get a snapshot instead.
+    """
+
+    def __init__(self, history=HISTORY, max_keys=MAX_KEYS):
+        self.epoch = uuid.uuid4().hex[:12]
+        self.seq = 0
+        self.events = deque(maxlen=history)
+        self.latest = OrderedDict()
+        self.max_keys = max_keys
+
+    def record(self, alert_data, key=None):
+        """Stamps ``alert_data`` with the next seq and stores it; returns the event."""
+        self.seq += 1
+        event = {"seq": self.seq, **alert_data}
+        self.events.append(event)
+        if key is not None:
+            self.latest.pop(key, None)
+            if not alert_data.get("removed"):
+                self.latest[key] = event
+                if len(self.latest) > self.max_keys:
+                    self.latest.popitem(last=False)
+        return event
+
+    def since(self, seq, epoch=None):
+        """Events after ``seq``, or None if the client needs a snapshot instead.
+
+        That is when some of the events already left the ring, or ``seq`` is
+        ahead of ours or from another ``epoch`` (the server restarted).
+        """
+        if (epoch is not None and epoch != self.epoch) or seq > self.seq:
+            return None
+        if seq == self.seq:
+            return []
+        if not self.events or seq < self.events[0]["seq"] - 1:
+            return None
+        return list(islice(self.events, seq - self.events[0]["seq"] + 1, None))
+
+    def snapshot(self, wants=None, recent=RECENT_IN_SNAPSHOT):
+        """Latest event per key plus the most recent events, filtered by ``wants``."""
+        wants = wants or (lambda event: True)
+        recent_events = []
+        for event in reversed(self.events):
+            if len(recent_events) == recent:
+                break
+            if wants(event):
+                recent_events.append(event)
+        return {
+            "type": "snapshot",
+            "epoch": self.epoch,
+            "seq": self.seq,
+            "state": [e for e in self.latest.values() if wants(e)],
+            "recent": recent_events[::-1],
+        }
@@ -0,0 +1,124 @@
+import os
+import stat
+import subprocess
+import sys
+import threading
+import time
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client
+
+import pytest
+
+import event_bus
+from event_bus import (EventBus, FatigueScore, Rejected, RunwayAssignment, bridge_to_broadcaster, connect,
+                       load_authkey, serve_bus)
+
+ATLAS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+def test_subscribers_get_the_published_object():
+    bus = EventBus()
+    received = []
+    bus.subscribe(FatigueScore, received.append)
+    event = FatigueScore(station="desk1", level=3)
+    bus.publish(event)
+    assert received == [event] and received[0] is event
+
+
+def test_subscribing_mid_lookup_does_not_leave_a_stale_dispatch_entry():
+    bus = EventBus()
+    late = []
+
+    class SubscribeDuringLookup(dict):
+        fired = False
+
+        def get(self, key, default=None):
+            if key is not FatigueScore and not self.fired:  # FatigueScore's own handlers already read
+                self.fired = True
+                bus.subscribe(FatigueScore, late.append)  # lands between the lookup and the cache write
+            return super().get(key, default)
+
+    bus._handlers = SubscribeDuringLookup()
+    bus.publish(FatigueScore(station="desk1", level=1))
+    event = FatigueScore(station="desk1", level=2)
+    bus.publish(event)
+    assert late == [event]
+
+
+def test_runway_producer_reaches_the_hub(tmp_path, monkeypatch):
+    monkeypatch.setenv("ATLAS_BUS_KEY", "test-key")
+    bus = EventBus()
+    alerts = []
+    done = threading.Event()
+
+    def notify(module, message, level="info", **data):
+        alerts.append((module, data["flight"], data["runway"]))
+        if len(alerts) == 6:
+            done.set()
+
+    bridge_to_broadcaster(bus, notify)
+    address = str(tmp_path / "bus.sock")
+    listener = serve_bus(bus, address)
+    try:
+        with pytest.raises(AuthenticationError):
+            Client(address, authkey=b"wrong-key")
+        # The real producer, run the way an operator would; six flights in Runway_simulation
+        subprocess.run([sys.executable, "Runway_simulation.py", "--no-tables", "--bus", address,
+                        "--output", str(tmp_path / "frames")],
+                       cwd=os.path.join(ATLAS_DIR, "runway_allocator"), check=True,
+                       env={**os.environ, "MPLBACKEND": "Agg"})
+        assert done.wait(10)
+    finally:
+        listener.close()
+    assert sorted(flight for _, flight, _ in alerts) == [1, 2, 3, 4, 5, 6]
+    assert all(module == "runway" for module, _, _ in alerts)
+
+
+def test_hub_keeps_working_after_a_subscriber_fails():
+    bus = EventBus()
+    received = []
+    bus.subscribe(RunwayAssignment, lambda e: 1 / 0)
+    bus.subscribe(RunwayAssignment, received.append)
+    bus.publish(RunwayAssignment(1, "Small", "runway_1", 0, 5))
+    assert len(received) == 1
+
+
+def test_hub_creates_a_private_key_file(tmp_path, monkeypatch):
+    monkeypatch.delenv("ATLAS_BUS_KEY", raising=False)
+    monkeypatch.setattr(event_bus, "RUNTIME_DIR", str(tmp_path / "run"))
+    monkeypatch.setattr(event_bus, "KEY_FILE", str(tmp_path / "run" / "bus.key"))
+    with pytest.raises(FileNotFoundError):
+        load_authkey()
+    key = load_authkey(create=True)
+    assert len(key) == 64 and load_authkey() == key
+    assert stat.S_IMODE(os.stat(event_bus.KEY_FILE).st_mode) == 0o600
+    assert stat.S_IMODE(os.stat(event_bus.RUNTIME_DIR).st_mode) == 0o700
+
+    os.chmod(event_bus.KEY_FILE, 0o644)
+    with pytest.raises(PermissionError):
+        load_authkey()
+
+
+def test_send_reports_rejection_and_timeout(tmp_path, monkeypatch):
+    monkeypatch.setenv("ATLAS_BUS_KEY", "test-key")
+    bus = EventBus()
+
+    def handle(event):
+        if event.level == 5:
+            raise Rejected("too tired")
+        if event.level == 9:
+            time.sleep(0.5)
+
+    bus.subscribe(FatigueScore, handle)
+    address = str(tmp_path / "bus.sock")
+    listener = serve_bus(bus, address)
+    try:
+        remote = connect(address)
+        remote.send(FatigueScore("desk1", 1))
+        with pytest.raises(Rejected, match="too tired"):
+            remote.send(FatigueScore("desk1", 5))
+        with pytest.raises(ConnectionError):
+            remote.send(FatigueScore("desk1", 9), timeout=0.1)
+        remote.send(FatigueScore("desk1", 2))  # a fresh connection after the timeout
+    finally:
+        listener.close()
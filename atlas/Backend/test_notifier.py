@@ -0,0 +1,105 @@
+import asyncio
+import json
+
+from notifier import Broadcaster
+
+
+class FakeSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, message):
+        self.sent.append(json.loads(message))
+
+
+def test_keyed_alerts_are_coalesced_and_then_forgotten():
+    async def scenario():
+        broadcaster = Broadcaster(coalesce_interval=0.05)
+        broadcaster.attach(asyncio.get_running_loop())
+        socket = FakeSocket()
+        broadcaster.add(socket)
+        for level in range(5):
+            broadcaster.publish({"module": "fatigue", "level": level}, key=("fatigue", "desk1"))
+        for i in range(50):
+            broadcaster.publish({"module": "runway", "flight": i}, key=("runway", i))
+        await asyncio.sleep(0.2)
+        return broadcaster, socket
+
+    broadcaster, socket = asyncio.run(scenario())
+    fatigue = [m["level"] for m in socket.sent if m.get("module") == "fatigue"]
+    assert fatigue == [0, 4]  # first at once, then only the latest
+    assert broadcaster._last_sent == {} and broadcaster._pending == {}
+
+
+def test_reconnecting_clients_share_one_serialised_snapshot(monkeypatch):
+    async def scenario():
+        broadcaster = Broadcaster()
+        broadcaster.attach(asyncio.get_running_loop())
+        for i in range(100):
+            broadcaster.publish({"module": "runway", "flight": i}, key=("runway", i))
+        builds = []
+        snapshot = broadcaster.store.snapshot
+        monkeypatch.setattr(broadcaster.store, "snapshot", lambda wants: builds.append(1) or snapshot(wants))
+
+        sockets = [FakeSocket() for _ in range(50)]
+        for socket in sockets:
+            broadcaster.add(socket)
+            broadcaster.sync(socket)
+        await asyncio.sleep(0)
+        assert len(builds) == 1
+
+        broadcaster.publish({"module": "comms", "message": "x"})  # new seq: the cached one is stale
+        late = FakeSocket()
+        broadcaster.add(late)
+        broadcaster.sync(late)
+        await asyncio.sleep(0.01)
+        return builds, sockets, late
+
+    builds, sockets, late = asyncio.run(scenario())
+    assert len(builds) == 2
+    assert all(s.sent[0] == sockets[0].sent[0] for s in sockets)
+    assert late.sent[0]["seq"] == sockets[0].sent[0]["seq"] + 1
+
+
+def test_malformed_subscriptions_are_refused_and_change_nothing():
+    async def scenario():
+        broadcaster = Broadcaster()
+        broadcaster.attach(asyncio.get_running_loop())
+        socket = FakeSocket()
+        client = broadcaster.add(socket)
+        broadcaster.handle_message(socket, json.dumps({"subscribe": {"modules": ["fatigue"]}}))
+        broadcaster.handle_message(socket, json.dumps({"subscribe": {"modules": [["x"]]}}))  # unhashable
+        broadcaster.handle_message(socket, json.dumps({"subscribe": {"modules": "fatigue"}}))  # not a list
+        broadcaster.handle_message(socket, json.dumps({"resume": True}))
+        await asyncio.sleep(0.01)
+        return client, socket
+
+    client, socket = asyncio.run(scenario())
+    assert client.filters == {"module": {"fatigue"}}
+    assert [m["type"] for m in socket.sent] == ["subscribed", "snapshot", "error", "error", "snapshot"]
+    assert socket.sent[2]["error"] == "'modules' must be a list of strings"
+
+
+def test_stalled_dashboard_is_dropped_and_shutdown_does_not_hang():
+    class StalledSocket(FakeSocket):
+        closed = False
+
+        async def send(self, message):
+            await asyncio.sleep(10)
+
+        async def close(self):
+            self.closed = True
+
+    async def scenario():
+        broadcaster = Broadcaster(send_timeout=0.05)
+        broadcaster.attach(asyncio.get_running_loop())
+        stalled, healthy = StalledSocket(), FakeSocket()
+        broadcaster.add(stalled)
+        broadcaster.add(healthy)
+        broadcaster.publish({"module": "comms", "message": "x"})
+        await asyncio.sleep(0.2)
+        return broadcaster, stalled, healthy
+
+    for _ in range(3):  # cancelling senders at shutdown used to race with a finishing send
+        broadcaster, stalled, healthy = asyncio.run(scenario())
+    assert stalled.closed and len(broadcaster) == 1 and healthy.sent
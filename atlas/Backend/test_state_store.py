@@ -0,0 +1,37 @@
+import random
+
+from state_store import StateStore
+
+
+def test_since_matches_the_full_log():
+    rng = random.Random(23)
+    store = StateStore(history=50, max_keys=10)
+    log = []
+    for _ in range(500):
+        log.append(store.record({"module": "runway", "value": rng.random()}, key=rng.randrange(20)))
+        seq = rng.randrange(store.seq + 1)
+        events = store.since(seq, store.epoch)
+        expected = [e for e in log if e["seq"] > seq]
+        if events is None:
+            assert len(expected) > len(store.events)  # only when the ring no longer covers them
+        else:
+            assert events == expected
+
+
+def test_client_ahead_or_from_another_epoch_gets_a_snapshot():
+    store = StateStore()
+    for i in range(5):
+        store.record({"module": "fatigue", "level": i}, key="desk1")
+    assert store.since(5) == []
+    assert store.since(3, store.epoch) == list(store.events)[3:]
+    assert store.since(9) is None  # e.g. the server restarted and counts from 0 again
+    assert store.since(3, "old-epoch") is None
+    assert StateStore().epoch != store.epoch
+
+
+def test_latest_state_is_capped_and_tombstones_clear_keys():
+    store = StateStore(max_keys=3)
+    for key in "abcd":
+        store.record({"module": "runway"}, key=key)
+    store.record({"module": "runway", "removed": True}, key="c")
+    assert [e["seq"] for e in store.snapshot()["state"]] == [2, 4]
@@ -0,0 +1,185 @@
+# Offline fatigue analysis of recorded shift videos
+#
+#   python batch_analysis.py recordings/ --output timeline.csv --workers 8
+#
+# Same EAR/MAR/blink/head/face-touch logic as the live detector, no camera or
+# display. Each worker process loads its own Mediapipe models.
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import cv2
+import pandas as pd
+
+from calibration import Calibrator
+from hand_tracking import AdaptiveHandDetector
+from monitor import SMOOTHING_FRAMES, FatigueMonitor
+
+FRAME_WIDTH = 640
+FRAME_HEIGHT = 480
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mkv", ".mov", ".webm")
+
+_hands = None  # per-worker Mediapipe Hands
+
+
+def _init_worker():
+    global _hands
+    import mediapipe as mp
+    # Static: a worker goes from video to video, and the detector crops and skips frames
+    _hands = mp.solutions.hands.Hands(static_image_mode=True, max_num_hands=2, min_detection_confidence=0.5)
+
+
+def _summarize(path, start, end, frames, face_frames, ear_sum, mar_sum, before, monitor, max_level):
+    after = monitor.counters()
+    row = {
+        "file": path,
+        "operator": monitor.operator,
+        "interval_start": start,
+        "interval_end": end,
+        "frames": frames,
+        "face_frames": face_frames,
+        "mean_ear": ear_sum / face_frames if face_frames else None,
+        "mean_mar": mar_sum / face_frames if face_frames else None,
+        "fatigue_level": monitor.fatigue_level,
+        "max_fatigue_level": max_level,
+    }
+    for name, value in after.items():
+        row[name] = value - before[name]
+    return row
+
+
+def analyze_video(path, interval=10.0, calibration_seconds=20.0, thresholds=None,
+                  hand_every_n=3, hand_roi=True, smoothing_frames=SMOOTHING_FRAMES):
+    """Per-interval fatigue rows for one recording.
+
+    Thresholds come from the first ``calibration_seconds`` of the video
+    unless given explicitly. Timestamps are video time (frame index / fps).
+    """
+    from utils import get_landmarks
+
+    if _hands is None:
+        _init_worker()
+
+    cap = cv2.VideoCapture(path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    hand_detector = AdaptiveHandDetector(_hands, FRAME_WIDTH, FRAME_HEIGHT, every_n=hand_every_n, roi=hand_roi)
+    operator = os.path.splitext(os.path.basename(path))[0]
+
+    calibrator = Calibrator(FRAME_WIDTH, FRAME_HEIGHT) if thresholds is None else None
+    monitor = FatigueMonitor(thresholds, FRAME_WIDTH, FRAME_HEIGHT, operator,
+                             smoothing_frames=smoothing_frames) if thresholds else None
+
+    rows = []
+    index = 0
+    interval_start = 0.0
+    frames = face_frames = 0
+    ear_sum = mar_sum = 0.0
+    max_level = 0
+    before = None
+
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        timestamp = index / fps
+        index += 1
+
+        frame = cv2.resize(frame, (FRAME_WIDTH, FRAME_HEIGHT))
+        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        landmarks = get_landmarks(rgb)
+
+        if monitor is None:
+            # Calibration phase at the start of the recording
+            if landmarks:
+                calibrator.add(landmarks)
+            if timestamp >= calibration_seconds:
+                monitor = FatigueMonitor(calibrator.thresholds(calibration_seconds), FRAME_WIDTH, FRAME_HEIGHT,
+                                         operator, smoothing_frames=smoothing_frames)
+                interval_start = timestamp
+            continue
+
+        if before is None:
+            before = monitor.counters()
+
+        frames += 1
+        if landmarks:
+            face_frames += 1
+            face_touched = hand_detector.process(rgb, landmarks)
+            reading = monitor.update(timestamp, landmarks, face_touched)
+            ear_sum += reading["ear"]
+            mar_sum += reading["mar"]
+            max_level = max(max_level, reading["fatigue_level"])
+
+        if timestamp - interval_start >= interval:
+            rows.append(_summarize(path, interval_start, timestamp, frames, face_frames,
+                                   ear_sum, mar_sum, before, monitor, max_level))
+            interval_start = timestamp
+            frames = face_frames = 0
+            ear_sum = mar_sum = 0.0
+            max_level = monitor.fatigue_level
+            before = monitor.counters()
+
+    if monitor is not None and frames:
+        rows.append(_summarize(path, interval_start, index / fps, frames, face_frames,
+                               ear_sum, mar_sum, before, monitor, max_level))
+    cap.release()
+    return rows
+
+
+def find_videos(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                for name in sorted(names):
+                    if name.lower().endswith(VIDEO_EXTENSIONS):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+
+def analyze_many(paths, workers=None, **options):
+    """Fan recordings out over a process pool; returns one DataFrame timeline."""
+    videos = list(find_videos(paths))
+    rows = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        futures = {pool.submit(analyze_video, video, **options): video for video in videos}
+        for future in as_completed(futures):
+            video = futures[future]
+            try:
+                rows.extend(future.result())
+                print(f"Done: {video}")
+            except Exception as e:
+                print(f"Failed: {video}: {e}")
+    timeline = pd.DataFrame(rows)
+    if not timeline.empty:
+        timeline = timeline.sort_values(["file", "interval_start"]).reset_index(drop=True)
+    return timeline
+
+
+def write_timeline(timeline, output):
+    if output.lower().endswith((".parquet", ".pq")):
+        timeline.to_parquet(output, index=False)
+    else:
+        timeline.to_csv(output, index=False)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless fatigue analysis of recorded videos")
+    parser.add_argument("paths", nargs="+", help="video files or directories")
+    parser.add_argument("--output", default="fatigue_timeline.csv", help=".csv or .parquet")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--interval", type=float, default=10.0, help="seconds per timeline row")
+    parser.add_argument("--calibration", type=float, default=20.0,
+                        help="seconds at the start of each video used for calibration")
+    parser.add_argument("--hand-every-n", type=int, default=3)
+    parser.add_argument("--no-hand-roi", action="store_true")
+    parser.add_argument("--smoothing-frames", type=int, default=SMOOTHING_FRAMES,
+                        help="EAR/MAR smoothing window in frames (e.g. 900 = 30 s at 30 fps)")
+    args = parser.parse_args()
+
+    timeline = analyze_many(args.paths, workers=args.workers, interval=args.interval,
+                            calibration_seconds=args.calibration, hand_every_n=args.hand_every_n,
+                            hand_roi=not args.no_hand_roi, smoothing_frames=args.smoothing_frames)
+    write_timeline(timeline, args.output)
+    print(f"Wrote {len(timeline)} rows to {args.output}")
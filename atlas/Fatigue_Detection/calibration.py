@@ -0,0 +1,160 @@
+# Per-user baseline calibration shared by the live detector and batch analysis
+
+import numpy as np
+
+from utils import eye_aspect_ratio, mouth_aspect_ratio
+
+DEFAULT_EAR_THRESHOLD = 0.21
+DEFAULT_MAR_THRESHOLD = 0.7
+DEFAULT_BLINK_RATE = 15  # blinks per minute
+DEFAULT_HEAD_MOVEMENT = 0.01
+CALIBRATION_BLINK_EAR = 0.25
+MIN_BLINK_SECONDS = 10  # blink rate needs at least this much calibration
+
+
+class StreamingHistogram:
+    """Fixed-bin histogram that also keeps the sum of the values in each bin.
+
+    Memory is constant no matter how many samples arrive. Trimmed means are
+    exact for whole bins and use the bin's own mean for the partially
+    included edge bins, so the error is bounded by one bin width.
+    """
+
+    def __init__(self, upper, bins):
+        self.width = upper / bins
+        self.bins = bins
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.sums = np.zeros(bins, dtype=np.float64)
+        self.count = 0
+
+    def add(self, value):
+        index = int(value / self.width)
+        if index >= self.bins:
+            index = self.bins - 1  # overflow bin (its sum still holds the real values)
+        elif index < 0:
+            index = 0
+        self.counts[index] += 1
+        self.sums[index] += value
+        self.count += 1
+
+    def trimmed_mean(self, low=0.1, high=0.9):
+        """Mean of the samples ranked ``[int(n*low), int(n*high))`` in sorted order."""
+        start, stop = int(self.count * low), int(self.count * high)
+        if stop <= start:
+            return None
+        upper_rank = np.cumsum(self.counts)
+        lower_rank = upper_rank - self.counts
+        taken = np.clip(np.minimum(upper_rank, stop) - np.maximum(lower_rank, start), 0, None)
+        used = taken > 0
+        total = float(np.sum(self.sums[used] / self.counts[used] * taken[used]))
+        return total / (stop - start)
+
+
+class Calibrator:
+    """Collects baseline EAR, MAR, blink and head-movement statistics in constant memory.
+
+    ``thresholds`` can be read at any time; ``check`` re-estimates them once
+    per ``check_interval`` and reports convergence once the EAR, MAR and
+    head-movement baselines have stayed within ``tolerance`` (relative) for
+    ``stable_checks`` estimates in a row and ``min_seconds`` have passed.
+    """
+
+    def __init__(self, width, height, check_interval=1.0, tolerance=0.02, stable_checks=3,
+                 min_seconds=MIN_BLINK_SECONDS + 2):
+        self.width = width
+        self.height = height
+        self.ear_values = StreamingHistogram(0.6, 1200)
+        self.mar_values = StreamingHistogram(2.0, 2000)
+        self.head_movements = StreamingHistogram(0.1, 4000)
+        self.blink_count = 0
+        self.last_ear = None
+        self.last_nose = None
+
+        self.check_interval = check_interval
+        self.tolerance = tolerance
+        self.stable_checks = stable_checks
+        self.min_seconds = min_seconds
+        self._last_check = None
+        self._last_estimate = None
+        self._stable = 0
+
+    def add(self, landmarks):
+        ear = eye_aspect_ratio(landmarks, self.width, self.height)
+        mar = mouth_aspect_ratio(landmarks, self.width, self.height)
+
+        # Record metrics
+        self.ear_values.add(ear)
+        self.mar_values.add(mar)
+
+        # Detect blinks for calibration
+        if self.last_ear is not None:
+            if self.last_ear > CALIBRATION_BLINK_EAR and ear < CALIBRATION_BLINK_EAR:
+                self.blink_count += 1
+        self.last_ear = ear
+
+        # Track head movement
+        nose = landmarks.landmark[1]
+        nose_pos = (nose.x, nose.y)
+        if self.last_nose is not None:
+            dx = abs(nose_pos[0] - self.last_nose[0])
+            dy = abs(nose_pos[1] - self.last_nose[1])
+            self.head_movements.add(max(dx, dy))
+        self.last_nose = nose_pos
+
+    def thresholds(self, seconds):
+        """(ear_threshold, mar_threshold, normal_blink_rate, normal_head_movement)"""
+        ear_threshold = DEFAULT_EAR_THRESHOLD
+        mar_threshold = DEFAULT_MAR_THRESHOLD
+        normal_blink_rate = DEFAULT_BLINK_RATE
+        normal_head_movement = DEFAULT_HEAD_MOVEMENT
+
+        # Trimmed means filter outliers
+        normal_ear = self.ear_values.trimmed_mean(0.1, 0.9)
+        if normal_ear is not None:
+            ear_threshold = normal_ear * 0.7  # 70% of normal as threshold
+
+        normal_mar = self.mar_values.trimmed_mean(0.1, 0.9)
+        if normal_mar is not None:
+            mar_threshold = normal_mar * 1.5  # 150% of normal as yawn threshold
+
+        head = self.head_movements.trimmed_mean(0.0, 0.9)  # Ignore top 10%
+        if head is not None:
+            normal_head_movement = head
+
+        if seconds > MIN_BLINK_SECONDS:  # Only if calibration was long enough
+            normal_blink_rate = (self.blink_count / seconds) * 60
+
+        return ear_threshold, mar_threshold, normal_blink_rate, normal_head_movement
+
+    def check(self, elapsed):
+        """Re-estimate if due; True once the thresholds have converged."""
+        if self._last_check is not None and elapsed - self._last_check < self.check_interval:
+            return False
+        self._last_check = elapsed
+
+        estimate = self.thresholds(elapsed)
+        previous, self._last_estimate = self._last_estimate, estimate
+        if previous is None or not self.ear_values.count:
+            return False
+
+        # Blink rate keeps moving in steps of one blink; it is covered by min_seconds
+        stable = [abs(estimate[i] - previous[i]) <= self.tolerance * abs(previous[i]) for i in (0, 1, 3)]
+        if all(stable):
+            self._stable += 1
+        else:
+            self._stable = 0
+        return elapsed >= self.min_seconds and self._stable >= self.stable_checks
+
+    @property
+    def estimate(self):
+        """Most recent estimate from ``check`` (None before the first one)."""
+        return self._last_estimate
+
+
+def print_thresholds(thresholds):
+    ear_threshold, mar_threshold, normal_blink_rate, normal_head_movement = thresholds
+    print(f"Calibration complete:")
+    print(f"- EAR threshold: {ear_threshold:.3f}")
+    print(f"- MAR threshold: {mar_threshold:.3f}")
+    print(f"- Normal blink rate: {normal_blink_rate:.1f} blinks/min")
+    print(f"- Normal head movement: {normal_head_movement:.5f}")
@@ -0,0 +1,100 @@
+# Persistent per-operator calibration thresholds with a staleness/expiry policy
+
+import json
+import os
+import threading
+import time
+
+from calibration import Calibrator
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".atlas", "calibration.json")
+REFRESH_AFTER = 12 * 3600     # older than this: use, but recalibrate in the background
+EXPIRE_AFTER = 30 * 24 * 3600  # older than this: ignore and run a full calibration
+
+FRESH, STALE, MISSING = "fresh", "stale", "missing"
+
+
+class CalibrationCache:
+    """JSON file of operator -> thresholds + timestamp.
+
+    ``get`` returns ``(thresholds, status)`` where status is ``"fresh"``
+    (use as is), ``"stale"`` (use now, recalibrate in the background) or
+    ``"missing"`` (unknown or expired operator: calibrate before monitoring).
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, refresh_after=REFRESH_AFTER, expire_after=EXPIRE_AFTER):
+        self.path = path
+        self.refresh_after = refresh_after
+        self.expire_after = expire_after
+        self._lock = threading.Lock()
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def get(self, operator, now=None):
+        if not operator:
+            return None, MISSING
+        with self._lock:
+            entry = self._load().get(operator)
+        if entry is None:
+            return None, MISSING
+
+        age = (now if now is not None else time.time()) - entry["calibrated_at"]
+        thresholds = (entry["ear_threshold"], entry["mar_threshold"],
+                      entry["normal_blink_rate"], entry["normal_head_movement"])
+        if age > self.expire_after:
+            return None, MISSING
+        if age > self.refresh_after:
+            return thresholds, STALE
+        return thresholds, FRESH
+
+    def put(self, operator, thresholds, now=None):
+        if not operator:
+            return
+        ear_threshold, mar_threshold, normal_blink_rate, normal_head_movement = thresholds
+        with self._lock:
+            entries = self._load()
+            entries[operator] = {
+                "ear_threshold": ear_threshold,
+                "mar_threshold": mar_threshold,
+                "normal_blink_rate": normal_blink_rate,
+                "normal_head_movement": normal_head_movement,
+                "calibrated_at": now if now is not None else time.time(),
+            }
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(entries, f, indent=2)
+            os.replace(tmp, self.path)  # atomic: readers never see a half-written file
+
+
+class BackgroundRecalibration:
+    """Recalibrates from the frames the monitor is already processing.
+
+    Monitoring starts immediately on the cached thresholds; every face frame
+    is also fed here and, once the streaming estimates converge (or
+    ``seconds`` pass), the new thresholds are returned by ``feed`` and saved.
+    """
+
+    def __init__(self, operator, cache, width, height, seconds=20):
+        self.operator = operator
+        self.cache = cache
+        self.seconds = seconds
+        self.calibrator = Calibrator(width, height)
+        self.start = None
+
+    def feed(self, timestamp, landmarks):
+        """Returns the new thresholds once recalibration finishes, else None."""
+        if self.start is None:
+            self.start = timestamp
+        self.calibrator.add(landmarks)
+        elapsed = timestamp - self.start
+        if elapsed >= self.seconds or self.calibrator.check(elapsed):
+            thresholds = self.calibrator.thresholds(min(elapsed, self.seconds))
+            self.cache.put(self.operator, thresholds)
+            return thresholds
+        return None
@@ -0,0 +1,110 @@
+# Adaptive, ROI-limited hand detection for face-touch counting
+
+import cv2
+import numpy as np
+
+
+def touches_face(hand_points, width, height):
+    """True if any hand point (normalized x, y) falls in the centre face box."""
+    for x, y in hand_points:
+        hand_x, hand_y = int(x * width), int(y * height)
+        if width//3 < hand_x < width*2//3 and height//4 < hand_y < height*3//4:
+            return True
+    return False
+
+
+def static_image_mode(every_n, roi):
+    """Mediapipe Hands ``static_image_mode`` for a detector with these settings.
+
+    Tracking mode reuses the previous call's hand box, in that input's
+    coordinates, so it is only valid when every call gets the next full
+    frame of one stream (``every_n=1, roi=False``).
+    """
+    return roi or every_n > 1
+
+
+class AdaptiveHandDetector:
+    """Wraps Mediapipe Hands so it does not run full-frame on every frame.
+
+    - ``every_n``: run inference at most every n-th frame ...
+    - ... unless the image around the face changed by more than
+      ``motion_threshold`` (mean absolute grey-level difference), so a hand
+      moving towards the face is picked up on the frame it appears
+    - ``roi``: run inference on a crop around the face landmarks (grown by
+      ``roi_margin`` face sizes on each side) instead of the whole frame
+
+    Between inference runs the last answer is held, so per-frame face-touch
+    counts stay comparable to running the model on every frame.
+    ``every_n=1, roi=False`` reproduces the original behaviour exactly.
+    Create ``hands`` with ``static_image_mode(every_n, roi)``.
+    """
+
+    def __init__(self, hands, width, height, every_n=3, motion_threshold=6.0, roi=True, roi_margin=0.75):
+        self.hands = hands
+        self.width = width
+        self.height = height
+        self.every_n = max(1, every_n)
+        self.motion_threshold = motion_threshold
+        self.roi = roi
+        self.roi_margin = roi_margin
+
+        self._frames_since_run = self.every_n  # run on the first frame
+        self._last_patch = None
+        self._last_touched = False
+        self.runs = 0
+        self.frames = 0
+
+    def face_box(self, landmarks):
+        xs = [p.x for p in landmarks.landmark]
+        ys = [p.y for p in landmarks.landmark]
+        x0, x1, y0, y1 = min(xs), max(xs), min(ys), max(ys)
+        mx = (x1 - x0) * self.roi_margin
+        my = (y1 - y0) * self.roi_margin
+        left = max(0, int((x0 - mx) * self.width))
+        right = min(self.width, int((x1 + mx) * self.width))
+        top = max(0, int((y0 - my) * self.height))
+        bottom = min(self.height, int((y1 + my) * self.height))
+        return left, top, right, bottom
+
+    def _motion(self, rgb, box):
+        left, top, right, bottom = box
+        if right <= left or bottom <= top:
+            return True
+        patch = cv2.resize(cv2.cvtColor(rgb[top:bottom, left:right], cv2.COLOR_RGB2GRAY), (32, 32),
+                           interpolation=cv2.INTER_AREA).astype(np.int16)
+        last, self._last_patch = self._last_patch, patch
+        if last is None:
+            return True
+        return float(np.abs(patch - last).mean()) > self.motion_threshold
+
+    def _detect(self, rgb, box):
+        if not self.roi:
+            results = self.hands.process(rgb)
+            left, top, w, h = 0, 0, self.width, self.height
+        else:
+            left, top, right, bottom = box
+            w, h = right - left, bottom - top
+            if w <= 0 or h <= 0:
+                return []
+            results = self.hands.process(np.ascontiguousarray(rgb[top:bottom, left:right]))
+
+        points = []
+        if results.multi_hand_landmarks:
+            for hand_landmarks in results.multi_hand_landmarks:
+                for point in hand_landmarks.landmark:
+                    # Back to full-frame normalized coordinates
+                    points.append(((left + point.x * w) / self.width, (top + point.y * h) / self.height))
+        return points
+
+    def process(self, rgb, landmarks):
+        """Face-touch flag for this frame."""
+        self.frames += 1
+        self._frames_since_run += 1
+
+        box = self.face_box(landmarks)
+        moved = self.every_n > 1 and self._motion(rgb, box)
+        if self._frames_since_run >= self.every_n or moved:
+            self._frames_since_run = 0
+            self.runs += 1
+            self._last_touched = touches_face(self._detect(rgb, box), self.width, self.height)
+        return self._last_touched
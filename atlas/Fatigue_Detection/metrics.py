@@ -0,0 +1,167 @@
+# Hot-path instrumentation for the fatigue pipeline: per-stage latency, FPS, drops, face-miss ratio
+
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BUCKET_BOUNDS_US = [2 ** i for i in range(21)]  # 1 us .. ~1 s, then overflow
+
+
+class LatencyHistogram:
+    """Log2-bucketed latency histogram; recording is a few integer ops."""
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKET_BOUNDS_US) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        us = int(seconds * 1e6)
+        index = us.bit_length() if us > 0 else 0
+        if index >= len(self.buckets):
+            index = len(self.buckets) - 1
+        self.buckets[index] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q):
+        """Upper bound (ms) of the bucket holding the q-th percentile."""
+        if not self.count:
+            return None
+        target = q / 100 * self.count
+        seen = 0
+        for index, n in enumerate(self.buckets):
+            seen += n
+            if seen >= target and n:
+                if index >= len(BUCKET_BOUNDS_US):
+                    return self.max * 1000
+                return BUCKET_BOUNDS_US[index] / 1000
+        return self.max * 1000
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count * 1000 if self.count else None,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "max_ms": self.max * 1000,
+            "buckets_us": dict(zip([str(b) for b in BUCKET_BOUNDS_US] + ["inf"], self.buckets)),
+        }
+
+
+class PipelineMetrics:
+    """Collects stage timings and frame counters.
+
+    Each stage histogram is only written by the thread running that stage,
+    so recording takes no lock; ``snapshot`` may be a frame behind.
+    """
+
+    enabled = True
+    clock = staticmethod(time.perf_counter)
+
+    def __init__(self, fps_window=1.0):
+        self.started = time.time()
+        self.stages = {}
+        self.frames = 0
+        self.face_frames = 0
+        self.no_face_frames = 0
+        self.dropped_frames = 0
+        self.fps = 0.0
+        self._fps_window = fps_window
+        self._fps_mark = (time.perf_counter(), 0)
+
+    def record(self, stage, started):
+        """Record ``clock() - started`` for ``stage``."""
+        hist = self.stages.get(stage)
+        if hist is None:
+            hist = self.stages[stage] = LatencyHistogram()
+        hist.record(time.perf_counter() - started)
+
+    def frame(self, face_detected, dropped_frames=None):
+        self.frames += 1
+        if face_detected:
+            self.face_frames += 1
+        else:
+            self.no_face_frames += 1
+        if dropped_frames is not None:
+            self.dropped_frames = dropped_frames
+
+        now = time.perf_counter()
+        mark_time, mark_frames = self._fps_mark
+        if now - mark_time >= self._fps_window:
+            self.fps = (self.frames - mark_frames) / (now - mark_time)
+            self._fps_mark = (now, self.frames)
+
+    def snapshot(self):
+        return {
+            "time": time.time(),
+            "uptime_s": time.time() - self.started,
+            "fps": self.fps,
+            "frames": self.frames,
+            "dropped_frames": self.dropped_frames,
+            "face_not_detected_ratio": self.no_face_frames / self.frames if self.frames else None,
+            "stages": {name: hist.snapshot() for name, hist in list(self.stages.items())},
+        }
+
+
+class NullMetrics:
+    """Drop-in replacement when instrumentation is off: every call is a no-op."""
+
+    enabled = False
+
+    @staticmethod
+    def clock():
+        return 0.0
+
+    def record(self, stage, started):
+        pass
+
+    def frame(self, face_detected, dropped_frames=None):
+        pass
+
+    def snapshot(self):
+        return {}
+
+
+def serve_metrics(metrics, port, host="127.0.0.1"):
+    """Serve ``GET /metrics`` as JSON from a daemon thread; returns the server."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip("/") not in ("", "/metrics"):
+                self.send_error(404)
+                return
+            body = json.dumps(metrics.snapshot()).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # keep the console for the detector
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+def dump_periodically(metrics, path, interval=10.0):
+    """Rewrite ``path`` with a JSON snapshot every ``interval`` seconds; returns a stop Event."""
+    stop = threading.Event()
+
+    def run():
+        while not stop.wait(interval):
+            tmp = f"{path}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(metrics.snapshot(), f, indent=2)
+            os.replace(tmp, path)
+
+    threading.Thread(target=run, name="metrics-dump", daemon=True).start()
+    return stop
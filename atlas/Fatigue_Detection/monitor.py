@@ -0,0 +1,182 @@
+# Per-operator fatigue state: EAR/MAR smoothing, blink/head/face-touch/yawn counters, scoring
+
+import cv2
+
+from rolling import RollingWindow
+from utils import eye_aspect_ratio, mouth_aspect_ratio
+
+UPDATE_INTERVAL = 10  # seconds
+MOUTH_OPEN_THRESHOLD = 0.45
+MOUTH_OPEN_TIME_MIN = 1.0
+MOUTH_OPEN_TIME_MAX = 1.2
+FATIGUE_COUNT_THRESHOLD = 5
+SMOOTHING_FRAMES = 5     # per-frame EAR/MAR smoothing window
+RATE_HISTORY_LENGTH = 3  # blink/head/face-touch rates kept (one per UPDATE_INTERVAL)
+
+
+class FatigueMonitor:
+    """Fatigue scoring for one operator.
+
+    Feed it one face frame at a time with ``update``; timestamps are
+    seconds (wall clock for a camera, frame time for a recorded video).
+    Every reading ``update`` returns is also passed to ``on_reading``
+    if one is set, which is how the live detector streams scores.
+    """
+
+    on_reading = None
+
+    def __init__(self, thresholds, width=640, height=480, operator=None,
+                 smoothing_frames=SMOOTHING_FRAMES, rate_history=RATE_HISTORY_LENGTH):
+        self.width = width
+        self.height = height
+        self.operator = operator
+        self.set_thresholds(thresholds)
+
+        # Runtime variables
+        self.blink_counter = 0
+        self.head_move_counter = 0
+        self.face_touch_counter = 0
+        self.fatigue_blink_counter = 0
+        self.fatigue_head_counter = 0
+        self.fatigue_face_counter = 0
+        self.fatigue_yawn_counter = 0
+        self.fatigue_mouth_open_counter = 0
+
+        self.last_ear, self.last_nose = None, None
+        self.mouth_open_start = None
+        self.start_time = None
+
+        # Rolling history
+        self.blink_history = RollingWindow(rate_history)
+        self.head_history = RollingWindow(rate_history)
+        self.face_touch_history = RollingWindow(rate_history)
+        self.ear_history = RollingWindow(smoothing_frames)
+        self.mar_history = RollingWindow(smoothing_frames)
+
+        self.fatigue_level = 0
+
+    def set_thresholds(self, thresholds):
+        self.ear_threshold, self.mar_threshold, self.normal_blink_rate, self.normal_head_movement = thresholds
+        self.blink_fatigue_threshold = min(35, self.normal_blink_rate * 1.6)
+        self.head_fatigue_threshold = self.normal_head_movement * 2.0
+
+    def update(self, current_time, landmarks, face_touched):
+        """Process one frame with a detected face; returns the reading for display."""
+        if self.start_time is None:
+            self.start_time = current_time
+
+        # EAR & MAR
+        ear = eye_aspect_ratio(landmarks, self.width, self.height)
+        mar = mouth_aspect_ratio(landmarks, self.width, self.height)
+
+        self.ear_history.append(ear)
+        self.mar_history.append(mar)
+
+        smoothed_ear = self.ear_history.mean()
+        smoothed_mar = self.mar_history.mean()
+
+        # Mouth open duration
+        if smoothed_mar > MOUTH_OPEN_THRESHOLD:
+            if self.mouth_open_start is None:
+                self.mouth_open_start = current_time
+            mouth_open_duration = current_time - self.mouth_open_start
+            if MOUTH_OPEN_TIME_MIN <= mouth_open_duration <= MOUTH_OPEN_TIME_MAX:
+                self.fatigue_mouth_open_counter += 1
+                self.mouth_open_start = None  # Reset after counting
+        else:
+            self.mouth_open_start = None
+
+        # Blink detection
+        if self.last_ear and self.last_ear > self.ear_threshold and ear < self.ear_threshold:
+            self.blink_counter += 1
+            self.fatigue_blink_counter += 1
+        self.last_ear = ear
+
+        # Head movement
+        nose = landmarks.landmark[1]
+        if self.last_nose:
+            dx = abs(nose.x - self.last_nose[0])
+            dy = abs(nose.y - self.last_nose[1])
+            if max(dx, dy) > self.normal_head_movement * 1.5:
+                self.head_move_counter += 1
+                self.fatigue_head_counter += 1
+        self.last_nose = (nose.x, nose.y)
+
+        # Face touch
+        if face_touched:
+            self.face_touch_counter += 1
+            self.fatigue_face_counter += 1
+
+        # Yawning detection
+        if mar > self.mar_threshold:
+            self.fatigue_yawn_counter += 1
+
+        # Update every 10s
+        elapsed = current_time - self.start_time
+        if elapsed > UPDATE_INTERVAL:
+            blink_rate = self.blink_counter / (elapsed / 60.0)
+            head_rate = self.head_move_counter / (elapsed / 60.0)
+            face_touch_rate = self.face_touch_counter / (elapsed / 60.0)
+
+            self.blink_history.append(blink_rate)
+            self.head_history.append(head_rate)
+            self.face_touch_history.append(face_touch_rate)
+
+            self.blink_counter = self.head_move_counter = self.face_touch_counter = 0
+            self.start_time = current_time
+
+        # === Fatigue Scoring System ===
+        fatigue_score = 0
+        fatigue_score += 1 if self.fatigue_blink_counter >= FATIGUE_COUNT_THRESHOLD else 0
+        fatigue_score += 1 if self.fatigue_head_counter >= FATIGUE_COUNT_THRESHOLD else 0
+        fatigue_score += 1 if self.fatigue_face_counter >= FATIGUE_COUNT_THRESHOLD else 0
+        fatigue_score += 1 if self.fatigue_yawn_counter >= FATIGUE_COUNT_THRESHOLD else 0
+        fatigue_score += 1 if self.fatigue_mouth_open_counter >= FATIGUE_COUNT_THRESHOLD else 0
+        self.fatigue_level = min(5, fatigue_score)
+
+        reading = {
+            "time": current_time,
+            "ear": ear,
+            "mar": mar,
+            "smoothed_ear": smoothed_ear,
+            "smoothed_mar": smoothed_mar,
+            "ear_std": self.ear_history.std(),
+            "face_touched": face_touched,
+            "fatigue_level": self.fatigue_level,
+        }
+        if self.on_reading is not None:
+            self.on_reading(reading)
+        return reading
+
+    def counters(self):
+        return {
+            "blinks": self.fatigue_blink_counter,
+            "head_moves": self.fatigue_head_counter,
+            "face_touches": self.fatigue_face_counter,
+            "yawns": self.fatigue_yawn_counter,
+            "mouth_opens": self.fatigue_mouth_open_counter,
+        }
+
+    def draw(self, frame, reading):
+        """Overlay the reading on a BGR frame."""
+        fatigue_level = reading["fatigue_level"]
+        label = f"Fatigue Level: {fatigue_level}/5"
+        if fatigue_level == 5:
+            label += " - FATIGUED"
+
+        if reading["face_touched"]:
+            cv2.putText(frame, "FACE TOUCH", (self.width - 180, 180), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (230, 100, 200), 2)
+
+        cv2.putText(frame, label, (30, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8,
+                    (0, 0, 255) if fatigue_level >= 4 else (0, 165, 255), 2)
+        cv2.putText(frame, f"EAR: {reading['smoothed_ear']:.2f}", (30, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 180), 2)
+        cv2.putText(frame, f"MAR: {reading['smoothed_mar']:.2f}", (30, 90), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 180), 2)
+        cv2.putText(frame, f"Mouth Opens: {self.fatigue_mouth_open_counter}", (30, 120), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (100, 200, 255), 2)
+        cv2.putText(frame, f"Yawns: {self.fatigue_yawn_counter}", (30, 150), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (200, 100, 255), 2)
+        cv2.putText(frame, f"Fatigue Blinks: {self.fatigue_blink_counter}", (30, 180), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 204, 0), 2)
+        cv2.putText(frame, f"Head Moves: {self.fatigue_head_counter}", (30, 210), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 100, 180), 2)
+        cv2.putText(frame, f"Face Touches: {self.fatigue_face_counter}", (30, 240), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (230, 100, 200), 2)
+
+
+def draw_no_face(frame):
+    cv2.putText(frame, "No Face Detected", (30, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 2)
@@ -0,0 +1,186 @@
+# Multi-station fatigue monitoring: N cameras, one process, one inference loop
+#
+#   python multi_station.py --camera desk1=0 --camera desk2=1 --camera tower=rtsp://...
+
+import argparse
+import queue
+import threading
+import time
+
+import cv2
+import mediapipe as mp
+
+from calibration import Calibrator, print_thresholds
+from calibration_cache import FRESH, MISSING, BackgroundRecalibration, CalibrationCache
+from hand_tracking import AdaptiveHandDetector
+from monitor import FatigueMonitor, draw_no_face
+from pipeline import STOP, LatestQueue, Packet
+
+FRAME_WIDTH = 640
+FRAME_HEIGHT = 480
+
+
+class Station:
+    """One controller position: its camera, face mesh, calibration and FatigueMonitor."""
+
+    def __init__(self, name, source, hands, calibration_seconds=20, thresholds=None, hand_every_n=3,
+                 cache=None):
+        self.name = name
+        self.cache = cache
+        self.recalibration = None
+        if thresholds is None and cache is not None:
+            # The station name doubles as the operator id for the calibration cache
+            thresholds, status = cache.get(name)
+            if status not in (FRESH, MISSING):
+                self.recalibration = BackgroundRecalibration(name, cache, FRAME_WIDTH, FRAME_HEIGHT,
+                                                             calibration_seconds)
+        self.cap = cv2.VideoCapture(source)
+        # Video (tracking) mode carries landmarks over from the previous frame, so it must only see this camera
+        self.face_mesh = mp.solutions.face_mesh.FaceMesh(static_image_mode=False, max_num_faces=1,
+                                                         min_detection_confidence=0.5, min_tracking_confidence=0.5)
+        self.frames = LatestQueue(1)
+        self.hand_detector = AdaptiveHandDetector(hands, FRAME_WIDTH, FRAME_HEIGHT, every_n=hand_every_n)
+        self.calibration_seconds = calibration_seconds
+        self.calibrator = None if thresholds else Calibrator(FRAME_WIDTH, FRAME_HEIGHT)
+        self.monitor = FatigueMonitor(thresholds, FRAME_WIDTH, FRAME_HEIGHT, name) if thresholds else None
+        self.calibration_start = None
+        self.finished = False
+        self._running = threading.Event()
+        self._thread = threading.Thread(target=self._capture, name=f"capture-{name}", daemon=True)
+
+    def start(self):
+        self._running.set()
+        self._thread.start()
+
+    def stop(self):
+        self._running.clear()
+        self._thread.join(timeout=1.0)
+        self.cap.release()
+        self.face_mesh.close()
+
+    def _capture(self):
+        index = 0
+        while self._running.is_set():
+            ret, frame = self.cap.read()
+            if not ret:
+                break
+            self.frames.put(Packet(index, time.time(), cv2.resize(frame, (FRAME_WIDTH, FRAME_HEIGHT))))
+            index += 1
+        self.frames.put(STOP)
+
+    def face_landmarks(self, rgb):
+        results = self.face_mesh.process(rgb)
+        return results.multi_face_landmarks[0] if results.multi_face_landmarks else None
+
+    def process(self, packet, rgb, landmarks):
+        """Score one frame (inference already done) and draw the overlay."""
+        frame = packet.frame
+        if self.monitor is None:
+            if self.calibration_start is None:
+                self.calibration_start = packet.timestamp
+            if landmarks:
+                self.calibrator.add(landmarks)
+            elapsed = packet.timestamp - self.calibration_start
+            cv2.putText(frame, f"Calibrating: {max(0, int(self.calibration_seconds - elapsed))}s", (30, 30),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
+            if elapsed >= self.calibration_seconds or self.calibrator.check(elapsed):
+                thresholds = self.calibrator.thresholds(min(elapsed, self.calibration_seconds))
+                print(f"[{self.name}]")
+                print_thresholds(thresholds)
+                if self.cache is not None:
+                    self.cache.put(self.name, thresholds)
+                self.monitor = FatigueMonitor(thresholds, FRAME_WIDTH, FRAME_HEIGHT, self.name)
+            return None
+
+        if not landmarks:
+            draw_no_face(frame)
+            return None
+        face_touched = self.hand_detector.process(rgb, landmarks)
+        reading = self.monitor.update(packet.timestamp, landmarks, face_touched)
+        self.monitor.draw(frame, reading)
+
+        if self.recalibration is not None:
+            thresholds = self.recalibration.feed(packet.timestamp, landmarks)
+            if thresholds is not None:
+                self.monitor.set_thresholds(thresholds)
+                self.recalibration = None
+        return reading
+
+
+class MultiStationRunner:
+    """Serves every station from one inference loop.
+
+    Mediapipe has no batched API, so the models are run round-robin over
+    the newest frame of each camera; stale frames are dropped by the
+    per-camera capture threads. Each station has its own face mesh in video
+    mode, which tracks landmarks between that camera's frames. The hands
+    model is shared and runs in static-image mode, because consecutive calls
+    see different cameras.
+    """
+
+    def __init__(self, sources, calibration_seconds=20, thresholds=None, hand_every_n=3, cache=None):
+        self.hands = mp.solutions.hands.Hands(static_image_mode=True, max_num_hands=2, min_detection_confidence=0.5)
+        self.stations = [Station(name, source, self.hands, calibration_seconds, thresholds, hand_every_n, cache)
+                         for name, source in sources.items()]
+
+    def step(self):
+        """One round-robin pass; returns {station: (frame, reading)} for stations with a new frame."""
+        updates = {}
+        for station in self.stations:
+            if station.finished:
+                continue
+            try:
+                packet = station.frames.get(timeout=0)
+            except queue.Empty:
+                continue
+            if packet is STOP:
+                station.finished = True
+                continue
+            rgb = cv2.cvtColor(packet.frame, cv2.COLOR_BGR2RGB)
+            landmarks = station.face_landmarks(rgb)
+            updates[station.name] = (packet.frame, station.process(packet, rgb, landmarks))
+        return updates
+
+    def run(self, display=True):
+        for station in self.stations:
+            station.start()
+        try:
+            while not all(station.finished for station in self.stations):
+                updates = self.step()
+                if not updates:
+                    time.sleep(0.002)
+                    continue
+                if display:
+                    for name, (frame, _) in updates.items():
+                        cv2.imshow(f"Fatigue Detection - {name}", frame)
+                    if cv2.waitKey(1) & 0xFF == ord("q"):
+                        break
+        finally:
+            for station in self.stations:
+                station.stop()
+            self.hands.close()
+            if display:
+                cv2.destroyAllWindows()
+
+
+def parse_camera(value):
+    name, _, source = value.partition("=")
+    if not source:
+        name, source = f"station{value}", value
+    return name, int(source) if source.isdigit() else source
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Monitor several controller positions from one process")
+    parser.add_argument("--camera", action="append", type=parse_camera, required=True,
+                        help="NAME=SOURCE (device index, file or stream URL); repeat per station")
+    parser.add_argument("--calibration", type=float, default=20.0, help="seconds of calibration per station")
+    parser.add_argument("--hand-every-n", type=int, default=3)
+    parser.add_argument("--no-display", action="store_true")
+    parser.add_argument("--no-cache", action="store_true", help="always calibrate; do not read or save thresholds")
+    args = parser.parse_args()
+
+    runner = MultiStationRunner(dict(args.camera), calibration_seconds=args.calibration,
+                                hand_every_n=args.hand_every_n,
+                                cache=None if args.no_cache else CalibrationCache())
+    runner.run(display=not args.no_display)
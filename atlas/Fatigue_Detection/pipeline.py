@@ -0,0 +1,135 @@
+# Staged capture/inference pipeline for the fatigue detector
+# capture thread -> face-mesh worker -> hands worker -> consumer (scoring/overlay)
+
+import queue
+import threading
+import time
+
+import cv2
+
+from metrics import NullMetrics
+
+STOP = None  # end-of-stream marker passed down the stages
+
+
+class LatestQueue:
+    """Bounded queue that drops the oldest item instead of blocking the producer.
+
+    Keeps every stage working on the freshest frame rather than letting
+    latency build up behind a slow stage.
+    """
+
+    def __init__(self, maxsize=1):
+        self._queue = queue.Queue(maxsize)
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def put(self, item):
+        with self._lock:
+            while True:
+                try:
+                    self._queue.put_nowait(item)
+                    return
+                except queue.Full:
+                    try:
+                        stale = self._queue.get_nowait()
+                    except queue.Empty:
+                        continue
+                    if stale is STOP:
+                        # Never drop the end-of-stream marker
+                        self._queue.put_nowait(stale)
+                        return
+                    self.dropped += 1
+
+    def get(self, timeout=None):
+        return self._queue.get(timeout=timeout)
+
+
+class Packet:
+    """One captured frame and everything the stages attach to it."""
+
+    __slots__ = ("index", "timestamp", "frame", "rgb", "landmarks", "face_touched")
+
+    def __init__(self, index, timestamp, frame):
+        self.index = index
+        self.timestamp = timestamp
+        self.frame = frame
+        self.rgb = None
+        self.landmarks = None
+        self.face_touched = False
+
+
+class FramePipeline:
+    """Runs capture and each inference stage on its own thread.
+
+    ``stages`` is a list of ``(name, fn)``; each ``fn(packet)`` fills in
+    fields of the packet. The caller consumes finished packets from
+    ``results()`` on its own thread (``cv2.imshow`` must stay there).
+    """
+
+    def __init__(self, cap, width, height, stages, maxsize=1, metrics=None):
+        self.cap = cap
+        self.metrics = metrics if metrics is not None else NullMetrics()
+        self.width = width
+        self.height = height
+        self.stages = stages
+        self._queues = [LatestQueue(maxsize) for _ in range(len(stages) + 1)]
+        self._running = threading.Event()
+        self._threads = []
+
+    @property
+    def dropped_frames(self):
+        return sum(q.dropped for q in self._queues)
+
+    def start(self):
+        self._running.set()
+        self._threads = [threading.Thread(target=self._capture, name="capture", daemon=True)]
+        for i, (name, fn) in enumerate(self.stages):
+            self._threads.append(threading.Thread(
+                target=self._work, args=(fn, self._queues[i], self._queues[i + 1]), name=name, daemon=True))
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self):
+        self._running.clear()
+        for thread in self._threads:
+            thread.join(timeout=1.0)
+
+    def _capture(self):
+        index = 0
+        clock = self.metrics.clock
+        while self._running.is_set():
+            started = clock()
+            ret, frame = self.cap.read()
+            if not ret:
+                break
+            packet = Packet(index, time.time(), cv2.resize(frame, (self.width, self.height)))
+            self.metrics.record("capture", started)
+            self._queues[0].put(packet)
+            index += 1
+        self._queues[0].put(STOP)
+
+    def _work(self, fn, inbox, outbox):
+        while self._running.is_set():
+            try:
+                packet = inbox.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if packet is not STOP:
+                fn(packet)
+            outbox.put(packet)
+            if packet is STOP:
+                break
+
+    def results(self):
+        """Yield finished packets until the capture source runs out or ``stop()``."""
+        outbox = self._queues[-1]
+        while self._running.is_set():
+            try:
+                packet = outbox.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if packet is STOP:
+                break
+            yield packet
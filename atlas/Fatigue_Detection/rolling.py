@@ -0,0 +1,83 @@
+# Fixed-capacity rolling window with O(1) running mean / variance
+
+import numpy as np
+
+
+class RollingWindow:
+    """Ring buffer over a NumPy array keeping running sum and sum of squares.
+
+    ``append``, ``mean`` and ``variance`` cost the same for a 5-sample window
+    as for 30 s of per-frame values. The sums are recomputed from the buffer
+    once per ``capacity`` appends so floating-point drift cannot build up.
+    """
+
+    def __init__(self, capacity):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._values = np.zeros(capacity, dtype=np.float64)
+        self._index = 0
+        self._count = 0
+        self._sum = 0.0
+        self._sumsq = 0.0
+        self._since_resync = 0
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def full(self):
+        return self._count == self.capacity
+
+    def append(self, value):
+        value = float(value)
+        if self._count == self.capacity:
+            old = self._values[self._index]
+            self._sum -= old
+            self._sumsq -= old * old
+        else:
+            self._count += 1
+        self._values[self._index] = value
+        self._sum += value
+        self._sumsq += value * value
+        self._index = (self._index + 1) % self.capacity
+
+        self._since_resync += 1
+        if self._since_resync >= self.capacity:
+            self._resync()
+
+    def _resync(self):
+        live = self._values[:self._count] if self._count < self.capacity else self._values
+        self._sum = float(live.sum())
+        self._sumsq = float(np.dot(live, live))
+        self._since_resync = 0
+
+    @property
+    def sum(self):
+        return self._sum
+
+    def mean(self):
+        return self._sum / self._count if self._count else 0.0
+
+    def variance(self):
+        """Population variance of the values in the window."""
+        if not self._count:
+            return 0.0
+        mean = self._sum / self._count
+        return max(0.0, self._sumsq / self._count - mean * mean)
+
+    def std(self):
+        return self.variance() ** 0.5
+
+    def last(self):
+        return self._values[(self._index - 1) % self.capacity] if self._count else None
+
+    def values(self):
+        """Window contents, oldest first (copy)."""
+        if self._count < self.capacity:
+            return self._values[:self._count].copy()
+        return np.roll(self._values, -self._index)
+
+    def clear(self):
+        self._index = self._count = self._since_resync = 0
+        self._sum = self._sumsq = 0.0
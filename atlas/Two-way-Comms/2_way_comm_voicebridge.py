@@ -176,6 +176,7 @@ def get_audio(label):
 def two_way_comm():
     atc_audio = get_audio("ATC")
     pilot_audio = get_audio("Pilot")
+    texts = {}
 
     for label, audio_file in [("ATC", atc_audio), ("Pilot", pilot_audio)]:
       if not audio_file:
@@ -184,6 +185,7 @@ def two_way_comm():
 
       result = whisper_model.transcribe(audio_file, language="en")
       text = result["text"].strip()
+      texts[label] = text.lower()
       alert, triggers, entities, phrases = analyze_and_alert(text)
 
       print(f"\n🗣 {label} Says:")
@@ -204,8 +206,8 @@ def two_way_comm():
 
     # 🔁 Check agreement
     print("\n🔁 Checking for communication alignment...") # Fixed: Indentation should align with the for loop
-    atc_text = whisper_model.transcribe(atc_audio)["text"].lower()
-    pilot_text = whisper_model.transcribe(pilot_audio)["text"].lower()
+    atc_text = texts.get("ATC", "")
+    pilot_text = texts.get("Pilot", "")
     if any(w in atc_text and w not in pilot_text for w in trigger_words):
         print("❗️ Mismatch Detected: Pilot may have missed instructions.")
     else:
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+# Batch transcription of archived ATC/pilot recordings for incident review
+#
+#   python archive_batch.py recordings/ --output review.jsonl --workers 4
+#
+# Results are appended to the JSONL as they finish; re-running with the same
+# output skips every recording already in it (matched on path, size and mtime).
+# Files named <name>_atc.* and <name>_pilot.* are paired and checked for a
+# missed readback.
+
+import argparse
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+AUDIO_EXTENSIONS = (".wav", ".flac", ".ogg", ".mp3", ".m4a")
+WHISPER_WINDOW = 30.0  # seconds: clips up to this length are decoded in batches
+PAIR_PATTERN = re.compile(r"^(?P<name>.+?)[_\-. ](?P<role>atc|pilot)$", re.IGNORECASE)
+
+
+# 📁 Discovery
+def find_audio(root, extensions=AUDIO_EXTENSIONS):
+    paths = []
+    for directory, _, files in os.walk(root):
+        for name in files:
+            if name.lower().endswith(extensions):
+                paths.append(os.path.join(directory, name))
+    return sorted(paths)
+
+
+def file_key(path):
+    stat = os.stat(path)
+    return f"{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}"
+
+
+def audio_duration(path):
+    try:
+        import soundfile as sf
+        return sf.info(path).duration
+    except Exception:
+        return None  # not readable by libsndfile: let Whisper's ffmpeg loader handle it
+
+
+def pair_role(path):
+    """``(pair name, "atc"|"pilot")`` for paired recordings, else None."""
+    stem = os.path.splitext(path)[0]
+    match = PAIR_PATTERN.match(stem)
+    if match is None:
+        return None
+    return match.group("name"), match.group("role").lower()
+
+
+def make_batches(paths, batch_size):
+    """Short clips sorted by length and chunked (similar lengths decode together); long ones alone."""
+    durations = {path: audio_duration(path) for path in paths}
+    short = sorted((p for p in paths if durations[p] is not None and durations[p] <= WHISPER_WINDOW),
+                   key=durations.get)
+    long = [p for p in paths if durations[p] is None or durations[p] > WHISPER_WINDOW]
+    batches = [(short[i:i + batch_size], True) for i in range(0, len(short), batch_size)]
+    batches += [([p], False) for p in long]
+    return batches, durations
+
+
+# 🧵 Worker side: one Whisper + spaCy model per process
+_service = None
+
+
+def _init_worker(whisper_model, spacy_model, device):
+    global _service
+    from transcription_service import TranscriptionService
+
+    _service = TranscriptionService(whisper_model, spacy_model, device=device, warmup=False)
+
+
+def _decode_batch(paths):
+    import torch
+    import whisper
+
+    model = _service.whisper_model
+    mels = [whisper.log_mel_spectrogram(whisper.pad_or_trim(whisper.load_audio(p)), model.dims.n_mels)
+            for p in paths]
+    options = whisper.DecodingOptions(language="en", fp16=model.device.type == "cuda")
+    results = whisper.decode(model, torch.stack(mels).to(model.device), options)
+    return [(r.text.strip(), r.language) for r in results]
+
+
+def _transcribe_batch(paths, batched):
+    """Returns one record dict per path; a failing file yields an error record."""
+    try:
+        if batched:
+            decoded = _decode_batch(paths)
+        else:
+            decoded = []
+            for path in paths:
+                result = _service.whisper_model.transcribe(path, language="en")
+                decoded.append((result["text"].strip(), result.get("language", "unknown")))
+    except Exception as e:
+        if len(paths) > 1:
+            return [record for path in paths for record in _transcribe_batch([path], False)]
+        return [{"type": "error", "path": paths[0], "error": repr(e)}]
+
+    analyses = _service.analyze_batch([text for text, _ in decoded])
+    return [{"type": "transcript", "path": path, "text": text, "language": language, **analysis}
+            for path, (text, language), analysis in zip(paths, decoded, analyses)]
+
+
+# 📄 Output
+def load_progress(output):
+    """Keys already transcribed, the texts of paired recordings and the pairs already checked."""
+    done, texts, pairs = set(), {}, set()
+    if not os.path.exists(output):
+        return done, texts, pairs
+    with open(output, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # torn last line from a crash
+            if record.get("type") == "transcript":
+                done.add(record["key"])
+                role = pair_role(record["path"])
+                if role:
+                    texts[role] = record["text"]
+            elif record.get("type") == "pair":
+                pairs.add(record["pair"])
+    return done, texts, pairs
+
+
+def run(root, output, workers=None, batch_size=16, whisper_model="base", spacy_model="en_core_web_sm", device=None):
+    from voicebridge import instructions_mismatch
+
+    done, texts, pairs = load_progress(output)
+    keys = {path: file_key(path) for path in find_audio(root)}
+    todo = [path for path, key in keys.items() if key not in done]
+    print(f"🎧 {len(keys)} recordings, {len(keys) - len(todo)} already done, {len(todo)} to transcribe")
+
+    batches, durations = make_batches(todo, batch_size)
+    written = errors = 0
+    with open(output, "a", encoding="utf-8") as out, \
+            ProcessPoolExecutor(workers, initializer=_init_worker,
+                                initargs=(whisper_model, spacy_model, device)) as pool:
+
+        def write(record):
+            out.write(json.dumps(record) + "\n")
+
+        futures = [pool.submit(_transcribe_batch, paths, batched) for paths, batched in batches]
+        for future in as_completed(futures):
+            for record in future.result():
+                path = record["path"]
+                if record["type"] == "error":
+                    errors += 1
+                    write(record)
+                    continue
+                record["key"] = keys[path]
+                record["duration"] = durations.get(path)
+                write(record)
+                written += 1
+
+                role = pair_role(path)
+                if role:
+                    texts[role] = record["text"]
+                    name = role[0]
+                    atc, pilot = texts.get((name, "atc")), texts.get((name, "pilot"))
+                    if atc is not None and pilot is not None and name not in pairs:
+                        pairs.add(name)
+                        write({"type": "pair", "pair": name, "atc": atc, "pilot": pilot,
+                               "mismatch": instructions_mismatch(atc, pilot)})
+            out.flush()  # a crash loses at most the batches still in flight
+
+    print(f"✅ {written} transcribed, {errors} failed -> {output}")
+    return written, errors
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Transcribe and analyse a directory of ATC/pilot recordings")
+    parser.add_argument("root", help="directory to scan recursively")
+    parser.add_argument("--output", default="transcripts.jsonl")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    parser.add_argument("--batch-size", type=int, default=16, help="clips per batched Whisper decode")
+    parser.add_argument("--whisper-model", default="base")
+    parser.add_argument("--spacy-model", default="en_core_web_sm")
+    parser.add_argument("--device", help="torch device, e.g. cpu or cuda")
+    args = parser.parse_args()
+
+    run(args.root, args.output, args.workers, args.batch_size, args.whisper_model, args.spacy_model, args.device)
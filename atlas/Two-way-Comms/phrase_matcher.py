@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+# Precompiled ATC phrase matching: anchor on each phrase's first word, verify only there
+
+import re
+
+NLP_PIPES = ("tok2vec", "ner")  # analyze_and_alert only needs tokens and entities
+
+_LITERAL = re.compile(r"[\w'-]+")
+
+
+def _leading_words(phrase):
+    """Literal words a match of ``phrase`` must start with, or None if not plain literals."""
+    depth = 0
+    for i, c in enumerate(phrase):
+        if c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+        elif c == " " and depth == 0:
+            phrase = phrase[:i]
+            break
+    if phrase.startswith("(") and phrase.endswith(")"):
+        phrase = phrase[1:-1]
+    words = phrase.split("|")
+    if all(_LITERAL.fullmatch(w) for w in words):
+        return words
+    return None
+
+
+class ATCPhraseMatcher:
+    """Finds which of ``phrases`` occur in a transcript.
+
+    Each phrase is compiled once and indexed by the literal word it has to
+    start with. ``search`` locates those anchor words with ``str.find`` and
+    runs a phrase's regex only at an anchor position, instead of scanning
+    the whole text once per phrase. Phrases without a literal first word
+    fall back to a plain ``search``. Results equal
+    ``[p for p in phrases if re.search(p, text)]``.
+    """
+
+    def __init__(self, phrases):
+        self.phrases = list(phrases)
+        self._compiled = [re.compile(p) for p in self.phrases]
+        self._anchors = {}
+        self._unanchored = []
+        for i, phrase in enumerate(self.phrases):
+            words = _leading_words(phrase)
+            if words is None:
+                self._unanchored.append(i)
+            else:
+                for word in words:
+                    self._anchors.setdefault(word, []).append(i)
+
+    def search(self, text):
+        """Phrases found in ``text`` (already lowered), in ``phrases`` order."""
+        found = set()
+        for word, indices in self._anchors.items():
+            pos = text.find(word)
+            while pos >= 0:
+                for i in indices:
+                    if i not in found and self._compiled[i].match(text, pos):
+                        found.add(i)
+                pos = text.find(word, pos + 1)
+        for i in self._unanchored:
+            if self._compiled[i].search(text):
+                found.add(i)
+        return [self.phrases[i] for i in sorted(found)]
+
+
+def load_nlp(name="en_core_web_sm", pipes=NLP_PIPES):
+    """spaCy model with every pipe except ``pipes`` disabled."""
+    import spacy
+
+    nlp = spacy.load(name)
+    nlp.select_pipes(enable=[p for p in nlp.pipe_names if p in pipes])
+    return nlp
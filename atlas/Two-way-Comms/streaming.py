@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+# Streaming transcription for live radio feeds: VAD-segmented, overlapping-window Whisper
+#
+#   python streaming.py --file tower.wav
+#   ffmpeg -i rtsp://... -f s16le -ac 1 -ar 16000 - | python streaming.py --stdin
+
+import argparse
+import os
+import sys
+
+import numpy as np
+
+from transcription_service import SAMPLE_RATE, TranscriptionService
+
+BLOCK_SECONDS = 0.1
+
+
+# 🎧 PCM sources: each yields float32 mono blocks at 16 kHz
+def _to_mono_16k(block, rate):
+    if block.ndim > 1:
+        block = block.mean(axis=1)
+    if rate != SAMPLE_RATE:
+        n = int(round(len(block) * SAMPLE_RATE / rate))
+        block = np.interp(np.linspace(0, len(block), n, endpoint=False), np.arange(len(block)), block)
+    return block.astype(np.float32, copy=False)
+
+
+def file_source(path, block_seconds=BLOCK_SECONDS):
+    import soundfile as sf
+
+    rate = sf.info(path).samplerate
+    for block in sf.blocks(path, blocksize=int(rate * block_seconds), dtype="float32"):
+        yield _to_mono_16k(block, rate)
+
+
+def pipe_source(stream, sample_rate=SAMPLE_RATE, block_seconds=BLOCK_SECONDS):
+    """Raw signed 16-bit little-endian mono PCM from a binary stream (e.g. stdin)."""
+    size = int(sample_rate * block_seconds) * 2
+    pending = b""
+    while True:
+        data = stream.read(size)
+        if not data:
+            break
+        data = pending + data
+        cut = len(data) - len(data) % 2
+        pending = data[cut:]
+        yield _to_mono_16k(np.frombuffer(data[:cut], dtype="<i2") / 32768.0, sample_rate)
+
+
+def microphone_source(device=None, block_seconds=BLOCK_SECONDS):
+    import queue
+    import sounddevice as sd
+
+    blocks = queue.Queue()
+    with sd.InputStream(samplerate=SAMPLE_RATE, channels=1, dtype="float32", device=device,
+                        blocksize=int(SAMPLE_RATE * block_seconds),
+                        callback=lambda data, frames, t, status: blocks.put(data[:, 0].copy())):
+        while True:
+            yield blocks.get()
+
+
+# 🔈 Voice activity
+class EnergyVAD:
+    """Frame-energy voice activity detector with an adaptive noise floor.
+
+    A frame is speech when its RMS is ``ratio`` above the tracked noise
+    floor; an utterance ends after ``hangover`` seconds without speech.
+    """
+
+    def __init__(self, frame_seconds=0.03, ratio=3.0, min_rms=0.005, hangover=0.6):
+        self.frame = int(SAMPLE_RATE * frame_seconds)
+        self.ratio = ratio
+        self.min_rms = min_rms
+        self.hangover_frames = int(hangover / frame_seconds)
+        self.noise = min_rms
+        self.silent_frames = 0
+        self.active = False
+        self._rest = np.zeros(0, dtype=np.float32)
+
+    def frames(self, block):
+        """Yields ``(frame, is_speech, utterance_ended)`` per full frame; a partial tail waits for the next block."""
+        block = np.concatenate([self._rest, block]) if len(self._rest) else block
+        usable = len(block) - len(block) % self.frame
+        self._rest = block[usable:]
+        for start in range(0, usable, self.frame):
+            frame = block[start:start + self.frame]
+            rms = float(np.sqrt(np.mean(frame * frame)))
+            speech = rms > max(self.noise * self.ratio, self.min_rms)
+            if not speech:
+                self.noise = 0.95 * self.noise + 0.05 * rms
+
+            ended = False
+            if speech:
+                self.active = True
+                self.silent_frames = 0
+            elif self.active:
+                self.silent_frames += 1
+                if self.silent_frames >= self.hangover_frames:
+                    self.active = False
+                    ended = True
+            yield frame, speech, ended
+
+
+# 📡 Streaming transcriber
+class StreamingTranscriber:
+    """Turns a stream of PCM blocks into partial and final transcripts.
+
+    While an utterance is in progress, the last ``window_seconds`` of it
+    are re-decoded every ``step_seconds`` (consecutive windows overlap), and
+    each partial is run through ``analyze_and_alert``; alerts are reported
+    once per utterance, the first time a trigger, entity or phrase shows up.
+    The utterance is decoded in full when the VAD closes it, or when it
+    reaches ``max_seconds`` (Whisper's 30 s context).
+    """
+
+    def __init__(self, service, vad=None, step_seconds=1.0, window_seconds=10.0, max_seconds=30.0):
+        self.service = service
+        self.vad = vad or EnergyVAD()
+        self.step = int(SAMPLE_RATE * step_seconds)
+        self.window = int(SAMPLE_RATE * window_seconds)
+        self.max_samples = int(SAMPLE_RATE * max_seconds)
+        self.pre_roll = self.vad.frame * 10  # keep a little audio from before speech onset
+        self._reset()
+        self.position = 0  # samples consumed
+
+    def _reset(self):
+        self.frames = []
+        self.samples = 0
+        self.since_decode = 0
+        self.utterance_start = None
+        self.seen = set()
+
+    def feed(self, block):
+        """Consumes one block; returns the list of transcript events it produced."""
+        events = []
+        for frame, speech, ended in self.vad.frames(block):
+            self.position += len(frame)
+            if self.utterance_start is None:
+                self.frames.append(frame)
+                self.samples += len(frame)
+                while self.samples - len(self.frames[0]) >= self.pre_roll:
+                    self.samples -= len(self.frames.pop(0))
+                if speech:
+                    self.utterance_start = self.position - self.samples
+                    self.since_decode = 0
+                continue
+
+            self.frames.append(frame)
+            self.samples += len(frame)
+            self.since_decode += len(frame)
+            if ended or self.samples >= self.max_samples:
+                events.append(self._decode(final=True))
+            elif self.since_decode >= self.step:
+                events.append(self._decode(final=False))
+        return events
+
+    def flush(self):
+        """Finalises an utterance still open at the end of the stream."""
+        if self.utterance_start is None:
+            return []
+        return [self._decode(final=True)]
+
+    def _decode(self, final):
+        audio = np.concatenate(self.frames)
+        if not final:
+            audio = audio[-self.window:]
+        result = self.service._transcribe_audio(audio, condition_on_previous_text=False)
+        text = result["text"].strip()
+        analysis = self.service.analyze(text) if text else {"alert": False, "triggers": [], "entities": [], "phrases": []}
+
+        found = ([("trigger", t) for t in analysis["triggers"]]
+                 + [("entity", tuple(e)) for e in analysis["entities"]]
+                 + [("phrase", p) for p in analysis["phrases"]])
+        new = [item for item in dict.fromkeys(found) if item not in self.seen]
+        self.seen.update(new)
+
+        event = {
+            "type": "final" if final else "partial",
+            "start": self.utterance_start / SAMPLE_RATE,
+            "end": self.position / SAMPLE_RATE,
+            "text": text,
+            **analysis,
+            "new_alerts": [{"kind": kind, "value": value} for kind, value in new],
+        }
+        if final:
+            self._reset()
+        else:
+            self.since_decode = 0
+        return event
+
+    def run(self, source):
+        """Yields transcript events for every block of ``source``."""
+        for block in source:
+            yield from self.feed(block)
+        yield from self.flush()
+
+
+def _print_event(event):
+    tag = "📝" if event["type"] == "final" else "…"
+    print(f"{tag} [{event['start']:6.1f}-{event['end']:6.1f}s] {event['text']}")
+    for alert in event["new_alerts"]:
+        print(f"   🚨 {alert['kind']}: {alert['value']}")
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Backend"))
+    from event_bus import add_bus_argument, comms_publisher, connect_from_args
+
+    parser = argparse.ArgumentParser(description="Live VAD-segmented Whisper transcription")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--file", help="audio file, read block by block as if live")
+    source.add_argument("--stdin", action="store_true", help="raw s16le mono PCM on stdin")
+    source.add_argument("--mic", action="store_true", help="capture from sounddevice")
+    parser.add_argument("--rate", type=int, default=SAMPLE_RATE, help="sample rate of --stdin PCM")
+    parser.add_argument("--step", type=float, default=1.0, help="seconds between partial decodes")
+    parser.add_argument("--window", type=float, default=10.0, help="seconds of audio per partial decode")
+    parser.add_argument("--whisper-model", default="base")
+    parser.add_argument("--spacy-model", default="en_core_web_sm")
+    parser.add_argument("--device", help="torch device, e.g. cpu or cuda")
+    add_bus_argument(parser, "new alerts")
+    args = parser.parse_args()
+
+    bus = connect_from_args(args)
+    publish = None if bus is None else comms_publisher(bus, source="stream")
+
+    if args.file:
+        blocks = file_source(args.file)
+    elif args.stdin:
+        blocks = pipe_source(sys.stdin.buffer, args.rate)
+    else:
+        blocks = microphone_source()
+
+    service = TranscriptionService(args.whisper_model, args.spacy_model, device=args.device)
+    streamer = StreamingTranscriber(service, step_seconds=args.step, window_seconds=args.window)
+    try:
+        for event in streamer.run(blocks):
+            _print_event(event)
+            if publish is not None and event["new_alerts"]:
+                publish(event)
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,40 @@
+import random
+import re
+
+from phrase_matcher import ATCPhraseMatcher
+from voicebridge import ATC_PHRASES
+
+# Phrases the anchor index can't cover, to exercise the fallback path
+EXTRA_PHRASES = [r"\d+ knots", r"(runway|taxiway) \w+", r".*mayday"]
+FILLER = ["to", "on", "the", "and", "9", "27", "118.7", "o'clock", "miles", "reapproach", "flight", "level",
+          "knots", "gate", "alpha", "x", "-", "pan"]
+
+
+def reference(phrases, text):
+    return [p for p in phrases if re.search(p, text)]
+
+
+def random_transcript(rng, vocabulary):
+    return " ".join(rng.choice(vocabulary) for _ in range(rng.randrange(1, 40)))
+
+
+def test_matcher_agrees_with_a_search_per_phrase():
+    phrases = ATC_PHRASES + EXTRA_PHRASES
+    matcher = ATCPhraseMatcher(phrases)
+    vocabulary = sorted(set(re.findall(r"[a-z'-]+", " ".join(ATC_PHRASES).lower()))) + FILLER
+    rng = random.Random(19)
+    hits = 0
+    for _ in range(3000):
+        text = random_transcript(rng, vocabulary)
+        expected = reference(phrases, text)
+        assert matcher.search(text) == expected, text
+        hits += bool(expected)
+    assert hits > 300  # the vocabulary produces real matches, not just empty results
+
+
+def test_matcher_finds_every_phrase_in_order():
+    matcher = ATCPhraseMatcher(ATC_PHRASES)
+    text = ("mayday mayday, pan-pan pan-pan, cleared to land runway 27, turn left heading 270, "
+            "contact tower on 118.7, squawk 7700 and declare fuel emergency")
+    assert matcher.search(text) == reference(ATC_PHRASES, text)
+    assert len(matcher.search(text)) == 6
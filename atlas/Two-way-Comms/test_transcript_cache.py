@@ -0,0 +1,18 @@
+from transcript_cache import TranscriptCache
+
+
+def test_only_the_used_fields_are_kept_and_counted():
+    cache = TranscriptCache(max_chars=40)
+    segments = [{"id": i, "tokens": list(range(50)), "text": "cleared to land"} for i in range(100)]
+    cache.put("a", {"text": "cleared to land", "language": "en", "segments": segments})
+    cache.put("b", {"text": "runway two seven", "language": "en", "segments": segments})
+    assert cache.get("a") == {"text": "cleared to land", "language": "en"}
+    cache.put("c", {"text": "x" * 20, "language": "en"})  # 17 + 18 + 22 chars > 40: least recent goes
+    assert cache.get("b") is None and len(cache) == 2
+
+
+def test_get_returns_a_copy():
+    cache = TranscriptCache()
+    cache.put("a", {"text": " roger ", "language": "en"})
+    cache.get("a")["text"] = "tampered"
+    assert cache.get("a")["text"] == " roger "
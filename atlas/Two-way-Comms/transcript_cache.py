@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+# Content-hash keyed LRU cache of Whisper transcripts
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+CHUNK_SIZE = 1 << 20
+KEPT_FIELDS = ("text", "language")  # all the service reads; segments and tokens are dropped
+
+
+def audio_digest(source):
+    """SHA-256 of the audio content: a file path, encoded bytes or a sample array."""
+    digest = hashlib.sha256()
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        digest.update(source)
+    elif isinstance(source, np.ndarray):
+        digest.update(f"{source.dtype}{source.shape}".encode())
+        digest.update(np.ascontiguousarray(source).data)
+    else:
+        with open(source, "rb") as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+class TranscriptCache:
+    """LRU map of (audio digest, decode options) -> Whisper result.
+
+    Only ``KEPT_FIELDS`` of each result are stored, and ``get`` returns a
+    copy. Bounded both by entry count and by total stored characters, so
+    a run over long recordings cannot grow without limit.
+    """
+
+    def __init__(self, max_entries=512, max_chars=4_000_000):
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self._entries = OrderedDict()
+        self._chars = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def key(digest, options):
+        return digest, json.dumps(options, sort_keys=True, default=str)
+
+    def get(self, key):
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(result)
+
+    @staticmethod
+    def _size(entry):
+        return sum(len(value) for value in entry.values())
+
+    def put(self, key, result):
+        entry = {name: str(result[name]) for name in KEPT_FIELDS if name in result}
+        with self._lock:
+            if key in self._entries:
+                self._chars -= self._size(self._entries.pop(key))
+            self._entries[key] = entry
+            self._chars += self._size(entry)
+            while self._entries and (len(self._entries) > self.max_entries or self._chars > self.max_chars):
+                _, evicted = self._entries.popitem(last=False)
+                self._chars -= self._size(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._chars = 0
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+# Long-lived transcription service: Whisper + spaCy loaded once, served over a local HTTP API
+#
+#   python transcription_service.py --port 5005
+#   curl -F audio=@atc_audio.wav http://127.0.0.1:5005/transcribe
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+import whisper
+from flask import Flask, jsonify, request
+
+from phrase_matcher import load_nlp
+from transcript_cache import TranscriptCache, audio_digest
+from voicebridge import analyze_and_alert, analyze_many, instructions_mismatch
+
+SAMPLE_RATE = 16000  # Whisper's input rate
+
+
+class TranscriptionService:
+    """Holds the Whisper and spaCy models for the lifetime of the process.
+
+    ``transcribe`` accepts a file path, raw encoded audio bytes (anything
+    ffmpeg can read) or a float32 mono 16 kHz NumPy array. Results are
+    cached by audio content, so re-analysing a recording skips Whisper.
+    ``on_analysis``, when set, receives each ``process`` result once it
+    has been analysed; ``--bus`` points it at the hub.
+    """
+
+    on_analysis = None
+
+    def __init__(self, whisper_model="base", spacy_model="en_core_web_sm", device=None, warmup=True,
+                 cache=None):
+        started = time.time()
+        self.model_name = whisper_model
+        self.cache = cache if cache is not None else TranscriptCache()
+        self.whisper_model = whisper.load_model(whisper_model, device=device)
+        self.nlp = load_nlp(spacy_model)
+        self._lock = threading.Lock()  # one decode at a time per model
+        if warmup:
+            self.warmup()
+        print(f"✅ Models loaded in {time.time() - started:.1f}s")
+
+    def warmup(self):
+        """Run one short decode so the first real request doesn't pay for lazy init."""
+        self._transcribe_audio(np.zeros(SAMPLE_RATE, dtype=np.float32))
+        self.nlp("cleared to land runway two seven")
+
+    def _transcribe_audio(self, audio, **options):
+        options.setdefault("language", "en")
+        with self._lock:
+            return self.whisper_model.transcribe(audio, **options)
+
+    def transcribe(self, source, **options):
+        options.setdefault("language", "en")
+        key = TranscriptCache.key(audio_digest(source), {"model": self.model_name, **options})
+        result = self.cache.get(key)
+        if result is None:
+            result = self._transcribe_source(source, **options)
+            self.cache.put(key, result)
+        return result
+
+    def _transcribe_source(self, source, **options):
+        if isinstance(source, (bytes, bytearray)):
+            with tempfile.NamedTemporaryFile(suffix=".audio", delete=False) as f:
+                f.write(source)
+                path = f.name
+            try:
+                return self._transcribe_audio(path, **options)
+            finally:
+                os.remove(path)
+        if isinstance(source, np.ndarray):
+            source = source.astype(np.float32, copy=False)
+        return self._transcribe_audio(source, **options)
+
+    def analyze(self, text):
+        return _as_dict(analyze_and_alert(self.nlp, text))
+
+    def analyze_batch(self, texts):
+        """``analyze`` for many transcripts in one ``nlp.pipe`` pass."""
+        return [_as_dict(result) for result in analyze_many(self.nlp, texts)]
+
+    def process(self, source, **options):
+        """Transcribe and analyse one transmission."""
+        result = self.transcribe(source, **options)
+        text = result["text"].strip()
+        processed = {"text": text, "language": result.get("language", "unknown"), **self.analyze(text)}
+        if self.on_analysis is not None:
+            self.on_analysis(processed)
+        return processed
+
+    def two_way(self, atc_source, pilot_source):
+        """ATC instruction + pilot readback, with the alignment check."""
+        atc = self.process(atc_source)
+        pilot = self.process(pilot_source)
+        return {"atc": atc, "pilot": pilot, "mismatch": instructions_mismatch(atc["text"], pilot["text"])}
+
+
+def _as_dict(analysis):
+    alert, triggers, entities, phrases = analysis
+    return {
+        "alert": alert,
+        "triggers": triggers,
+        "entities": [list(e) for e in entities],
+        "phrases": phrases,
+    }
+
+
+def _request_audio(name):
+    if name in request.files:
+        return request.files[name].read()
+    if request.data and name == "audio":
+        return request.data
+    return None
+
+
+def create_app(service):
+    app = Flask(__name__)
+
+    @app.route("/health", methods=["GET"])
+    def health():
+        return jsonify({"status": "ok"})
+
+    @app.route("/transcribe", methods=["POST"])
+    def transcribe():
+        audio = _request_audio("audio")
+        if not audio:
+            return jsonify({"error": "send the audio as a multipart 'audio' file or as the request body"}), 400
+        return jsonify(service.process(audio))
+
+    @app.route("/two-way", methods=["POST"])
+    def two_way():
+        atc, pilot = _request_audio("atc"), _request_audio("pilot")
+        if not atc or not pilot:
+            return jsonify({"error": "send multipart 'atc' and 'pilot' files"}), 400
+        return jsonify(service.two_way(atc, pilot))
+
+    return app
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Backend"))
+    from event_bus import add_bus_argument, comms_publisher, connect_from_args
+
+    parser = argparse.ArgumentParser(description="Local Whisper/spaCy transcription service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5005)
+    parser.add_argument("--whisper-model", default="base")
+    parser.add_argument("--spacy-model", default="en_core_web_sm")
+    parser.add_argument("--device", help="torch device, e.g. cpu or cuda")
+    add_bus_argument(parser, "comms alerts")
+    args = parser.parse_args()
+
+    service = TranscriptionService(args.whisper_model, args.spacy_model, device=args.device)
+    bus = connect_from_args(args)
+    if bus is not None:
+        service.on_analysis = comms_publisher(bus)
+    create_app(service).run(host=args.host, port=args.port, threaded=True)
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+# Importable ATC/pilot analysis shared by the transcription service and batch tools
+# (same triggers, phrases and checks as the 2 way comm VoiceBridge notebook)
+
+from phrase_matcher import ATCPhraseMatcher
+
+# 📘 Triggers & Patterns
+trigger_words = { "descend", "maintain", "contact", "traffic", "approach", "runway", "heading", "climb", "turn",
+                  "left", "right", "direct", "altitude", "speed", "cleared", "hold", "pattern", "report",
+                  "position", "cross", "taxi", "exit", "wind", "visibility", "cloud", "pressure", "qnh", "ils",
+                  "visual", "vector", "mayday", "pan-pan", "emergency", "divert", "fuel", "minimum", "squawk",
+                  "declare", "assistance", "immediately", "unable", "jettison", "zero", "one", "two", "three",
+                  "four", "five", "six", "seven", "eight", "nine", "hundred", "thousand", "point", "decimal" }
+
+important_labels = {"ORG", "GPE", "LOC", "FAC", "DATE", "TIME", "CARDINAL", "QUANTITY"}
+
+ATC_PHRASES = [
+    r"cleared (to land|for takeoff|for approach)",
+    r"(maintain|climb|descend) to (flight level|altitude) \w+",
+    r"line up and wait",
+    r"contact (tower|approach|center) on \d+\.\d+",
+    r"hold short of (runway|taxiway) \w+",
+    r"taxi to (runway|gate) \w+ via \w+",
+    r"report (established|downwind|base|final)",
+    r"expect (approach|landing) clearance at \d+",
+    r"cleared (visual|ILS) approach (runway \w+)",
+    r"turn (left|right) heading \d+",
+    r"reduce speed to \d+ knots",
+    r"traffic (\d+ o'clock|(left|right)) (\d+ miles) (north|south|east|west)",
+    r"(mayday|pan-pan) (repeat mayday|pan-pan)",
+    r"squawk \d+",
+    r"declare (fuel|other) emergency",
+    r"request (priority|immediate) landing",
+    r"unable to (comply|maintain)",
+    r"request (lower|higher) altitude",
+    r"engine (failure|problem)",
+    r"request (vectors|assistance) to nearest airport"
+]
+
+phrase_matcher = ATCPhraseMatcher(ATC_PHRASES)
+
+
+# 🧠 NLP analysis
+def analyze_and_alert(nlp, text):
+    return analyze_doc(nlp(text), text)
+
+
+def analyze_many(nlp, texts, batch_size=64):
+    """``analyze_and_alert`` over many transcripts, batched through ``nlp.pipe``."""
+    texts = list(texts)
+    return [analyze_doc(doc, text) for doc, text in zip(nlp.pipe(texts, batch_size=batch_size), texts)]
+
+
+def analyze_doc(doc, text):
+    alert, triggers, entities = False, [], []
+
+    for ent in doc.ents:
+        if ent.label_ in important_labels:
+            entities.append((ent.text, ent.label_))
+            alert = True
+
+    for token in doc:
+        if token.text.lower() in trigger_words:
+            triggers.append(token.text.lower())
+            alert = True
+
+    phrases = phrase_matcher.search(text.lower())
+    if phrases:
+        alert = True
+
+    return alert, triggers, entities, phrases
+
+
+# 🔁 Check agreement
+def instructions_mismatch(atc_text, pilot_text):
+    """True if the ATC transmission has a trigger word the pilot readback lacks."""
+    atc_text, pilot_text = atc_text.lower(), pilot_text.lower()
+    return any(w in atc_text and w not in pilot_text for w in trigger_words)
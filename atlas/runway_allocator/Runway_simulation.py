@@ -1,9 +1,11 @@
-import networkx as nx
-import matplotlib.pyplot as plt
+import argparse
+import os
+import sys
 import pandas as pd
-import tkinter as tk
-from tkinter import ttk
-import matplotlib.animation as animation
+from renderer import LandingRenderer
+from scheduler import RunwayScheduler, flight_priority
+from table_view import export_table_async, run_tables, show_table
+from topology import DEFAULT_CONFIG, load_topology
 
 # ----------- Step 1: Define flights -----------
 flights = [
@@ -15,141 +17,69 @@ flights = [
     {"id": 6, "type": "Large", "eta": "12:30", "fuel_level": 20, "emergency": True, "required_runway_length": 12},
 ]
 
-# ----------- Step 2: Sort flights by priority -----------
-def flight_priority(f):
-    return (
-        not f["emergency"],       # Emergency flights first
-        f["fuel_level"],          # Lower fuel level has higher priority
-        {"Large": 3, "Medium": 2, "Small": 1}[f["type"]]  # Larger flights prioritized
-    )
-
-flights_sorted = sorted(flights, key=flight_priority)
-
-# ----------- Step 3: Show tables -----------
-def show_table(title, dataframe):
-    window = tk.Tk()
-    window.title(title)
-    window.geometry("800x300")
-
-    frame = ttk.Frame(window)
-    frame.pack(fill=tk.BOTH, expand=True)
-
-    tree = ttk.Treeview(frame, columns=list(dataframe.columns), show="headings")
-    for col in dataframe.columns:
-        tree.heading(col, text=col)
-        tree.column(col, width=100)
-
-    for _, row in dataframe.iterrows():
-        tree.insert("", "end", values=list(row))
-
-    scrollbar = ttk.Scrollbar(frame, orient="vertical", command=tree.yview)
-    tree.configure(yscroll=scrollbar.set)
-    tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-    scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-
-    window.mainloop()
-
-df_unordered = pd.DataFrame(flights)
-df_ordered = pd.DataFrame(flights_sorted)
-show_table("Unordered Flights", df_unordered)
-show_table("Ordered Flights by Priority", df_ordered)
-
 # ----------- Step 4: Setup Runways & Graph -----------
-G = nx.DiGraph()
-runway_1 = list(range(0, 12))     # Large
-runway_2 = list(range(12, 22))    # Medium
-runway_3 = list(range(22, 30))    # Small
-
-# Add nodes and edges
-for runway in [runway_1, runway_2, runway_3]:
-    for node in runway:
-        G.add_node(node)
-    for i in range(len(runway) - 1):
-        G.add_edge(runway[i], runway[i + 1])
-
-# Node positions for plotting
-pos = {}
-for i in range(12):
-    pos[i] = (i, 2)
-for i in range(12, 22):
-    pos[i] = (i - 12, 1)
-for i in range(22, 30):
-    pos[i] = (i - 22, 0)
-
-# ----------- Step 5: Assign runways and schedule -----------
-runway_next_free_time = {"runway_1": 0, "runway_2": 0, "runway_3": 0}
-schedule = []
-log_entries = []
-
-for i, flight in enumerate(flights_sorted):
-    if flight["type"] == "Large":
-        preferred_runways = [("runway_1", runway_1)]
-    elif flight["type"] == "Medium":
-        preferred_runways = [("runway_2", runway_2), ("runway_1", runway_1)]
-    else:
-        preferred_runways = [("runway_3", runway_3), ("runway_2", runway_2), ("runway_1", runway_1)]
-
-    # Find the earliest available runway (optimal selection)
-    best_option = min(preferred_runways, key=lambda x: runway_next_free_time[x[0]])
-    runway_key, runway = best_option
-
-    # Apply conflict buffer (2 frames) after previous flight
-    start_time = max(runway_next_free_time[runway_key], len(schedule) * 2)
-    end_time = start_time + len(runway) + 2  # traversal + 2 frame wait
-
-    schedule.append({
-        "flight": flight,
-        "runway": runway,
-        "start": start_time,
-        "end": end_time
-    })
-    runway_next_free_time[runway_key] = end_time + 2  # add buffer after landing
-
-    log_entries.append({
-        "Flight ID": flight["id"],
-        "Type": flight["type"],
-        "Emergency": flight["emergency"],
-        "Fuel Level": flight["fuel_level"],
-        "ETA": flight["eta"],
-        "Assigned Runway": runway_key,
-        "Start Time": start_time,
-        "End Time": end_time
-    })
+# Runway graph, positions and eligibility rules come from airports.json (see topology.py)
 
 # ----------- Step 6: Animate -----------
-fig, ax = plt.subplots(figsize=(10, 6))
-
-def update(frame):
-    ax.clear()
-    nx.draw(G, pos, with_labels=True, node_size=500, node_color='lightblue', edge_color='gray')
-
-    for sched in schedule:
-        flight = sched["flight"]
-        runway = sched["runway"]
-        start = sched["start"]
-        end = sched["end"]
-
-        if start <= frame < end - 2:  # moving
-            idx = frame - start
-            node = runway[min(idx, len(runway) - 1)]
-            nx.draw_networkx_nodes(G, pos, nodelist=[node], node_color='green', node_size=700)
-            x, y = pos[node]
-            ax.text(x, y + 0.3, f"F{flight['id']}", fontsize=10, fontweight='bold', ha='center')
-
-        elif frame == end - 2 or frame == end - 1:  # waiting
-            node = runway[-1]
-            nx.draw_networkx_nodes(G, pos, nodelist=[node], node_color='red', node_size=700)
-            x, y = pos[node]
-            ax.text(x, y + 0.3, f"F{flight['id']} (Wait)", fontsize=10, fontweight='bold', ha='center')
-
-    ax.set_title(f"Flight Landing Simulation - Frame {frame}")
-    ax.axis('off')
-
-total_frames = schedule[-1]['end'] + 5
-ani = animation.FuncAnimation(fig, update, frames=total_frames, interval=2000, repeat=False)
-plt.show()
-
-# ----------- Step 7: Display Runway Allocation Log -----------
-df_log = pd.DataFrame(log_entries)
-show_table("Runway Allocation Log", df_log)
-    
\ No newline at end of file
+def animate(G, pos, schedule, output=None):
+    if output is None:
+        return LandingRenderer(G, pos, schedule).show(interval=2000)
+
+    # Headless: .mp4/.gif -> animation file, anything else -> directory of PNG frames
+    renderer = LandingRenderer(G, pos, schedule, headless=True)
+    if os.path.splitext(output)[1].lower() in (".mp4", ".gif"):
+        renderer.save(output)
+    else:
+        renderer.save_frames(output)
+
+
+def main(output=None, export=None, tables=True, airports=DEFAULT_CONFIG, airport=None, bus=None):
+    # ----------- Step 2: Sort flights by priority -----------
+    flights_sorted = sorted(flights, key=flight_priority)
+
+    if tables:
+        df_unordered = pd.DataFrame(flights)
+        df_ordered = pd.DataFrame(flights_sorted)
+        show_table("Unordered Flights", df_unordered, block=False)
+        show_table("Ordered Flights by Priority", df_ordered, block=False)
+
+    topology = load_topology(airports, airport)
+    G, pos = topology.graph, topology.pos
+
+    # ----------- Step 5: Assign runways and schedule -----------
+    scheduler = RunwayScheduler.from_topology(topology)
+    if bus is not None:
+        from event_bus import runway_publisher
+        scheduler.on_assign = runway_publisher(bus)
+    scheduler.assign_batch(flights_sorted, presorted=True)
+    if bus is not None:
+        bus.flush()
+
+    df_log = pd.DataFrame(scheduler.log_entries)
+    pending_export = export_table_async(df_log, export) if export else None
+
+    animate(G, pos, scheduler.schedule, output)
+
+    # ----------- Step 7: Display Runway Allocation Log -----------
+    if tables:
+        show_table("Runway Allocation Log", df_log, block=False)
+        run_tables()
+
+    if pending_export is not None:
+        print(f"Allocation log written to {pending_export.result()}")
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Backend"))
+    from event_bus import add_bus_argument, connect_from_args
+
+    parser = argparse.ArgumentParser(description="Runway allocation and landing simulation")
+    parser.add_argument("--output", help="write the animation to an .mp4/.gif file or a PNG frame directory instead of showing it")
+    parser.add_argument("--export", help="write the allocation log to a .csv/.parquet file")
+    parser.add_argument("--no-tables", action="store_true", help="do not open the Tkinter table windows")
+    parser.add_argument("--airports", default=DEFAULT_CONFIG, help="airport topology data file")
+    parser.add_argument("--airport", help="airport to simulate (default: first in the file)")
+    add_bus_argument(parser, "runway assignments")
+    args = parser.parse_args()
+    main(args.output, args.export, tables=not args.no_tables, airports=args.airports, airport=args.airport,
+         bus=connect_from_args(args))
@@ -0,0 +1,168 @@
+# runway_allocator/benchmark.py
+# Scaling benchmark for runway allocation with reproducible synthetic traffic
+#
+#   python benchmark.py --sizes 10 1000 100000 --output bench.json
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from scheduler import CONFLICT_BUFFER, RunwayScheduler, flight_priority
+from topology import DEFAULT_CONFIG, load_aircraft_types, load_topology
+
+DEFAULT_SIZES = [10, 100, 1000, 10000, 100000, 1000000]
+TYPE_MIX = {"Small": 0.5, "Medium": 0.3, "Large": 0.2}
+
+
+def generate_flights(n, seed=0, type_mix=TYPE_MIX, emergency_rate=0.02,
+                     fuel_range=(10, 100), eta_distribution="uniform",
+                     first_eta=6 * 60, eta_span=18 * 60, bank_spread=15, aircraft_types=None):
+    """``n`` flights shaped like the ``flights`` list, identical for the same seed.
+
+    ``eta_distribution`` is ``"uniform"`` over the span or ``"banks"``:
+    arrivals clustered around the top of every hour. Runway lengths come
+    from ``aircraft_types`` (default: airports.json).
+    """
+    if aircraft_types is None:
+        aircraft_types = load_aircraft_types()
+    rng = random.Random(seed)
+    types, weights = list(type_mix), list(type_mix.values())
+    flights = []
+    for i in range(n):
+        ac_type = rng.choices(types, weights)[0]
+        if eta_distribution == "banks":
+            bank = first_eta + 60 * rng.randrange(max(1, eta_span // 60))
+            minute = int(rng.gauss(bank, bank_spread))
+        else:
+            minute = first_eta + rng.randrange(eta_span)
+        minute %= 24 * 60
+        flights.append({
+            "id": i + 1,
+            "type": ac_type,
+            "eta": f"{minute // 60:02d}:{minute % 60:02d}",
+            "fuel_level": rng.randint(*fuel_range),
+            "emergency": rng.random() < emergency_rate,
+            "required_runway_length": aircraft_types[ac_type]["required_runway_length"],
+        })
+    return flights
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return 0
+    index = min(len(sorted_values) - 1, max(0, int(round(q / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def _total_delay(log_entries):
+    # Frames each flight waited beyond its conflict-buffer slot
+    return sum(entry["Start Time"] - i * CONFLICT_BUFFER for i, entry in enumerate(log_entries))
+
+
+def run_scalar(flights, topology):
+    start = time.perf_counter()
+    flights_sorted = sorted(flights, key=flight_priority)
+    sort_seconds = time.perf_counter() - start
+
+    scheduler = RunwayScheduler.from_topology(topology)
+    latencies = []
+    clock = time.perf_counter_ns
+    start = time.perf_counter()
+    for flight in flights_sorted:
+        t0 = clock()
+        scheduler.assign(flight)
+        latencies.append(clock() - t0)
+    assign_seconds = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "sort_seconds": sort_seconds,
+        "assign_seconds": assign_seconds,
+        "assignments_per_second": len(flights) / assign_seconds if assign_seconds else None,
+        "latency_p50_us": _percentile(latencies, 50) / 1000,
+        "latency_p99_us": _percentile(latencies, 99) / 1000,
+        "total_delay": _total_delay(scheduler.log_entries),
+    }
+
+
+def run_bulk(flights, topology):
+    import pandas as pd
+    from bulk_allocation import allocate_bulk
+
+    df = pd.DataFrame(flights)
+    start = time.perf_counter()
+    log = allocate_bulk(df, topology.runways, topology.preferred_runways, topology.traversal_times,
+                        topology.conflicts)
+    seconds = time.perf_counter() - start
+
+    stagger = pd.RangeIndex(len(log)) * CONFLICT_BUFFER
+    return {
+        "assign_seconds": seconds,
+        "assignments_per_second": len(flights) / seconds if seconds else None,
+        "total_delay": int((log["Start Time"] - stagger).sum()),
+    }
+
+
+MODES = {"scalar": run_scalar, "bulk": run_bulk}
+
+
+def peak_memory(mode, flights, topology):
+    """Peak traced allocation in bytes; run separately so tracing does not skew timings."""
+    tracemalloc.start()
+    try:
+        MODES[mode](flights, topology)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(sizes, modes, seed=0, emergency_rate=0.02, eta_distribution="uniform",
+        airports=DEFAULT_CONFIG, airport=None, memory=True):
+    topology = load_topology(airports, airport)
+    results = []
+    for n in sizes:
+        flights = generate_flights(n, seed=seed, emergency_rate=emergency_rate,
+                                   eta_distribution=eta_distribution, aircraft_types=topology.aircraft_types)
+        for mode in modes:
+            result = {"mode": mode, "flights": n, "seed": seed}
+            result.update(MODES[mode](flights, topology))
+            if memory:
+                result["peak_memory_bytes"] = peak_memory(mode, flights, topology)
+            results.append(result)
+            print(f"{mode:>6} {n:>8} flights: {result['assignments_per_second']:,.0f} assignments/s", file=sys.stderr)
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "airport": topology.name,
+        "emergency_rate": emergency_rate,
+        "eta_distribution": eta_distribution,
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark runway allocation on synthetic traffic")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--modes", nargs="+", choices=sorted(MODES), default=["scalar"])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--emergency-rate", type=float, default=0.02)
+    parser.add_argument("--eta-distribution", choices=["uniform", "banks"], default="uniform")
+    parser.add_argument("--airports", default=DEFAULT_CONFIG)
+    parser.add_argument("--airport")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--output", help="JSON results file (default: stdout)")
+    args = parser.parse_args()
+
+    report = run(args.sizes, args.modes, seed=args.seed, emergency_rate=args.emergency_rate,
+                 eta_distribution=args.eta_distribution, airports=args.airports,
+                 airport=args.airport, memory=not args.no_memory)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
@@ -0,0 +1,110 @@
+# runway_allocator/bulk_allocation.py
+# Columnar runway allocation for whole-day what-if runs
+
+import numpy as np
+import pandas as pd
+
+from scheduler import CONFLICT_BUFFER, LANDING_WAIT, SIZE_RANK, default_airport, runway_conflicts
+
+LOG_COLUMNS = ["Flight ID", "Type", "Emergency", "Fuel Level", "ETA",
+               "Assigned Runway", "Start Time", "End Time"]
+
+
+def _as_frame(flights):
+    if isinstance(flights, pd.DataFrame):
+        return flights
+    df = pd.DataFrame(flights)
+    # Structured arrays with fixed-width bytes fields
+    for col in ("type", "eta"):
+        if col in df and df[col].dtype == object and len(df) and isinstance(df[col].iloc[0], bytes):
+            df[col] = df[col].str.decode("utf-8")
+    return df
+
+
+def priority_order(df):
+    """Row order equivalent to ``sorted(flights, key=flight_priority)``."""
+    size_rank = df["type"].map(SIZE_RANK).to_numpy()
+    not_emergency = ~df["emergency"].to_numpy(dtype=bool)
+    # lexsort is stable and sorts by the last key first
+    return np.lexsort((size_rank, df["fuel_level"].to_numpy(), not_emergency))
+
+
+def allocate_bulk(flights, runways=None, preferred_runways=None, traversal_times=None, conflicts=None):
+    """Allocate a DataFrame / structured array of flights; returns the log as a DataFrame.
+
+    Priorities, eligibility masks and end times are computed on whole
+    columns. The runway free-time recurrence is inherently sequential, so
+    it runs as a tight loop over plain integers instead of per-flight dicts.
+    Crossing runways (``conflicts``) are held together and the runway
+    tables default as in ``RunwayScheduler``.
+    """
+    if runways is None or preferred_runways is None:
+        airport = default_airport()
+        runways = runways if runways is not None else airport.runways
+        preferred_runways = preferred_runways if preferred_runways is not None else airport.preferred_runways
+    conflicts = conflicts if conflicts is not None else runway_conflicts(runways)
+
+    df = _as_frame(flights)
+    ordered = df.iloc[priority_order(df)].reset_index(drop=True)
+
+    runway_keys = list(runways)
+    if traversal_times is None:
+        traversal_times = {key: len(nodes) for key, nodes in runways.items()}
+    lengths = np.array([traversal_times[key] for key in runway_keys], dtype=np.int64)
+
+    # Type -> runway eligibility masks (columns follow preference order via rank)
+    type_codes, type_names = pd.factorize(ordered["type"])
+    n_runways = len(runway_keys)
+    eligible = np.zeros((len(type_names), n_runways), dtype=bool)
+    preference = np.full((len(type_names), n_runways), n_runways, dtype=np.int64)
+    for code, ac_type in enumerate(type_names):
+        if not preferred_runways.get(ac_type):
+            raise KeyError(f"No runway can take a {ac_type} aircraft")  # as RunwayScheduler
+        for rank, key in enumerate(preferred_runways[ac_type]):
+            idx = runway_keys.index(key)
+            eligible[code, idx] = True
+            preference[code, idx] = rank
+    candidates = [
+        [int(idx) for idx in np.argsort(preference[code], kind="stable") if eligible[code, idx]]
+        for code in range(len(type_names))
+    ]
+    crossing = [[runway_keys.index(other) for other in conflicts[key]] for key in runway_keys]
+
+    n = len(ordered)
+    stagger = np.arange(n, dtype=np.int64) * CONFLICT_BUFFER
+    occupancy = (lengths + LANDING_WAIT + CONFLICT_BUFFER).tolist()
+    free = [0] * n_runways
+    assigned = np.empty(n, dtype=np.int64)
+    starts = np.empty(n, dtype=np.int64)
+
+    for i, (code, earliest) in enumerate(zip(type_codes.tolist(), stagger.tolist())):
+        options = candidates[code]
+        r = options[0]
+        for idx in options[1:]:
+            if free[idx] < free[r]:
+                r = idx
+        start = free[r] if free[r] > earliest else earliest
+        free[r] = start + occupancy[r]
+        for idx in crossing[r]:
+            if free[idx] < free[r]:
+                free[idx] = free[r]
+        assigned[i] = r
+        starts[i] = start
+
+    ends = starts + lengths[assigned] + LANDING_WAIT
+
+    return pd.DataFrame({
+        "Flight ID": ordered["id"].to_numpy(),
+        "Type": ordered["type"].to_numpy(),
+        "Emergency": ordered["emergency"].to_numpy(dtype=bool),
+        "Fuel Level": ordered["fuel_level"].to_numpy(),
+        "ETA": ordered["eta"].to_numpy(),
+        "Assigned Runway": np.asarray(runway_keys, dtype=object)[assigned],
+        "Start Time": starts,
+        "End Time": ends,
+    }, columns=LOG_COLUMNS)
+
+
+def bulk_log_entries(flights, runways=None, preferred_runways=None, traversal_times=None, conflicts=None):
+    """Same records as ``RunwayScheduler.log_entries`` for the sorted flights."""
+    return allocate_bulk(flights, runways, preferred_runways, traversal_times, conflicts).to_dict("records")
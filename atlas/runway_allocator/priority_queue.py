@@ -0,0 +1,90 @@
+# runway_allocator/priority_queue.py
+# Indexed binary heap: push / pop / update (decrease- or increase-key) / remove by id
+
+
+class IndexedPriorityQueue:
+    """Min-heap of ``(key, item_id)`` pairs with an id -> heap position index.
+
+    ``update`` and ``remove`` locate an item through the index instead of
+    scanning, so both run in O(log n).
+    """
+
+    def __init__(self):
+        self._heap = []       # [(key, item_id)]
+        self._position = {}   # item_id -> index in _heap
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __contains__(self, item_id):
+        return item_id in self._position
+
+    def key(self, item_id):
+        return self._heap[self._position[item_id]][0]
+
+    def peek(self):
+        key, item_id = self._heap[0]
+        return item_id, key
+
+    def push(self, item_id, key):
+        if item_id in self._position:
+            raise KeyError(f"{item_id!r} is already queued")
+        self._heap.append((key, item_id))
+        self._position[item_id] = len(self._heap) - 1
+        self._sift_up(len(self._heap) - 1)
+
+    def pop(self):
+        key, item_id = self._heap[0]
+        self._remove_at(0)
+        return item_id, key
+
+    def remove(self, item_id):
+        self._remove_at(self._position[item_id])
+
+    def update(self, item_id, key):
+        index = self._position[item_id]
+        old_key = self._heap[index][0]
+        self._heap[index] = (key, item_id)
+        if key < old_key:
+            self._sift_up(index)
+        else:
+            self._sift_down(index)
+
+    def _remove_at(self, index):
+        _, item_id = self._heap[index]
+        del self._position[item_id]
+        last = self._heap.pop()
+        if index < len(self._heap):
+            self._heap[index] = last
+            self._position[last[1]] = index
+            self._sift_up(index)
+            self._sift_down(self._position[last[1]])
+
+    def _swap(self, i, j):
+        heap = self._heap
+        heap[i], heap[j] = heap[j], heap[i]
+        self._position[heap[i][1]] = i
+        self._position[heap[j][1]] = j
+
+    def _sift_up(self, index):
+        heap = self._heap
+        while index > 0:
+            parent = (index - 1) // 2
+            if heap[index][0] < heap[parent][0]:
+                self._swap(index, parent)
+                index = parent
+            else:
+                break
+
+    def _sift_down(self, index):
+        heap = self._heap
+        size = len(heap)
+        while True:
+            smallest = index
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < size and heap[child][0] < heap[smallest][0]:
+                    smallest = child
+            if smallest == index:
+                break
+            self._swap(index, smallest)
+            index = smallest
@@ -0,0 +1,115 @@
+# runway_allocator/renderer.py
+# Frame-cached landing animation: static graph drawn once, only aircraft markers move
+
+import os
+
+import networkx as nx
+import matplotlib.animation as animation
+from matplotlib.figure import Figure
+
+from scheduler import LANDING_WAIT
+
+MOVING_COLOR = "green"
+WAITING_COLOR = "red"
+
+
+def build_frame_index(schedule, total_frames):
+    """frame -> [(node, label, waiting)] for every aircraft visible on that frame."""
+    frames = [[] for _ in range(total_frames)]
+    for sched in schedule:
+        flight = sched["flight"]
+        runway = sched["runway"]
+        start = sched["start"]
+        end = sched["end"]
+
+        for frame in range(start, min(end - LANDING_WAIT, total_frames)):  # moving
+            node = runway[min(frame - start, len(runway) - 1)]
+            frames[frame].append((node, f"F{flight['id']}", False))
+        for frame in range(max(start, end - LANDING_WAIT), min(end, total_frames)):  # waiting
+            frames[frame].append((runway[-1], f"F{flight['id']} (Wait)", True))
+    return frames
+
+
+class LandingRenderer:
+    """Renders the landing simulation without redrawing the runway graph per frame.
+
+    With ``headless=True`` the figure is created without pyplot, so frames can
+    be written on a server with no display.
+    """
+
+    def __init__(self, G, pos, schedule, total_frames=None, figsize=(10, 6), headless=False):
+        self.pos = pos
+        self.total_frames = total_frames if total_frames is not None else schedule[-1]["end"] + 5
+
+        if headless:
+            self.fig = Figure(figsize=figsize)
+            self.ax = self.fig.add_subplot()
+        else:
+            import matplotlib.pyplot as plt
+            self.fig, self.ax = plt.subplots(figsize=figsize)
+
+        # Static part, drawn once
+        nx.draw(G, pos, ax=self.ax, with_labels=True, node_size=500, node_color='lightblue', edge_color='gray')
+        self.ax.axis('off')
+
+        self._markers = self.ax.scatter([], [], s=700, zorder=3)
+        self._labels = []
+        self._title = self.ax.set_title("")
+        self._frames = build_frame_index(schedule, self.total_frames)
+
+    def _label(self, i):
+        while len(self._labels) <= i:
+            self._labels.append(self.ax.text(0, 0, "", fontsize=10, fontweight='bold', ha='center', zorder=4))
+        return self._labels[i]
+
+    def update(self, frame):
+        active = self._frames[frame]
+        if active:
+            self._markers.set_offsets([self.pos[node] for node, _, _ in active])
+            self._markers.set_facecolor([WAITING_COLOR if waiting else MOVING_COLOR for _, _, waiting in active])
+        else:
+            self._markers.set_offsets([[float("nan"), float("nan")]])
+
+        for i, (node, text, _) in enumerate(active):
+            label = self._label(i)
+            x, y = self.pos[node]
+            label.set_position((x, y + 0.3))
+            label.set_text(text)
+            label.set_visible(True)
+        for label in self._labels[len(active):]:
+            label.set_visible(False)
+
+        self._title.set_text(f"Flight Landing Simulation - Frame {frame}")
+        return [self._markers, self._title, *self._labels]
+
+    def animation(self, interval=2000):
+        return animation.FuncAnimation(self.fig, self.update, frames=self.total_frames,
+                                       interval=interval, repeat=False)
+
+    def show(self, interval=2000):
+        import matplotlib.pyplot as plt
+        ani = self.animation(interval)
+        plt.show()
+        return ani
+
+    def save(self, path, fps=2, dpi=100):
+        """Write an MP4 (needs ffmpeg) or GIF (Pillow), picked from the file extension."""
+        ext = os.path.splitext(path)[1].lower()
+        if ext == ".gif":
+            writer = animation.PillowWriter(fps=fps)
+        elif ext == ".mp4":
+            writer = animation.FFMpegWriter(fps=fps)
+        else:
+            raise ValueError(f"Unsupported animation format: {ext or path}")
+        self.animation().save(path, writer=writer, dpi=dpi)
+
+    def save_frames(self, directory, pattern="frame_{:05d}.png", dpi=100):
+        """Write every frame as a PNG; returns the file paths."""
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for frame in range(self.total_frames):
+            self.update(frame)
+            path = os.path.join(directory, pattern.format(frame))
+            self.fig.savefig(path, dpi=dpi)
+            paths.append(path)
+        return paths
@@ -0,0 +1,153 @@
+# runway_allocator/resequencer.py
+# Incremental re-sequencing of the landing queue when a flight's priority changes
+
+from bisect import bisect_left, bisect_right
+from collections import deque
+
+from priority_queue import IndexedPriorityQueue
+from scheduler import RunwayScheduler, flight_priority
+
+CHECKPOINT_EVERY = 16  # planned flights per saved scheduler state
+
+
+class Resequencer:
+    """Keeps a runway plan in ``flight_priority`` order up to date under edits.
+
+    Flights waiting to be planned sit in an indexed priority queue, so a
+    fuel drop, an emergency or an ETA slip is a decrease-key (or removal)
+    instead of a full re-sort. The planned prefix stores the scheduler state
+    in front of every ``CHECKPOINT_EVERY``-th flight; an edit rolls the plan
+    back to the checkpoint before the first position it can affect and
+    re-plans the flights behind it.
+
+    Rolled-back flights are already in order and all land before anything
+    still queued, so they go to the front of a sorted backlog in O(1) per
+    flight rather than back through the heap; ``plan`` merges the backlog
+    with the queue. An emergency that rolls back the whole plan then costs
+    about as much as scheduling from scratch, without the re-sort.
+
+    Ties in ``flight_priority`` keep arrival order, which matches
+    ``sorted(flights, key=flight_priority)``.
+    """
+
+    def __init__(self, scheduler=None):
+        self.scheduler = scheduler if scheduler is not None else RunwayScheduler()
+        self._offset = len(self.scheduler.schedule)
+        self._flights = {}       # flight id -> flight
+        self._arrival = {}       # flight id -> arrival sequence number
+        self._next_arrival = 0
+        self._queue = IndexedPriorityQueue()   # flights not yet planned (new or edited)
+        self._backlog = deque()  # rolled-back (key, flight id) entries, ascending; may hold stale ones
+        self._backlog_entry = {} # flight id -> its live entry in _backlog
+        self._plan_ids = []      # planned flight ids, in landing order
+        self._plan_keys = []     # their priority keys (ascending)
+        self._plan_index = {}    # flight id -> position in the plan
+        self._checkpoints = []   # scheduler state in front of plan positions 0, CHECKPOINT_EVERY, ...
+
+    def __len__(self):
+        return len(self._flights)
+
+    def __contains__(self, flight_id):
+        return flight_id in self._flights
+
+    @property
+    def schedule(self):
+        self.plan()
+        return self.scheduler.schedule[self._offset:]
+
+    @property
+    def log_entries(self):
+        self.plan()
+        return self.scheduler.log_entries[self._offset:]
+
+    def _key(self, flight_id):
+        return flight_priority(self._flights[flight_id]), self._arrival[flight_id]
+
+    def _invalidate_from(self, key):
+        """Roll back the planned flights that would now land behind ``key``."""
+        if self._plan_keys and key < self._plan_keys[-1]:
+            self._rollback(bisect_right(self._plan_keys, key))
+
+    def _rollback(self, index):
+        if index >= len(self._plan_ids):
+            return
+        checkpoint = index // CHECKPOINT_EVERY
+        index = checkpoint * CHECKPOINT_EVERY
+        entries = list(zip(self._plan_keys[index:], self._plan_ids[index:]))
+        for entry in entries:
+            del self._plan_index[entry[1]]
+            self._backlog_entry[entry[1]] = entry
+        self._backlog.extendleft(reversed(entries))  # all ahead of the existing backlog
+        self.scheduler.rollback(self._checkpoints[checkpoint], self._offset + index)
+        del self._plan_ids[index:]
+        del self._plan_keys[index:]
+        del self._checkpoints[checkpoint:]
+
+    def add(self, flight):
+        flight_id = flight["id"]
+        if flight_id in self._flights:
+            raise KeyError(f"Flight {flight_id!r} is already sequenced")
+        self._flights[flight_id] = flight
+        self._arrival[flight_id] = self._next_arrival
+        self._next_arrival += 1
+
+        key = self._key(flight_id)
+        self._invalidate_from(key)
+        self._queue.push(flight_id, key)
+
+    def add_batch(self, flights):
+        for flight in flights:
+            self.add(flight)
+
+    def update(self, flight_id, **changes):
+        """Change fields of a flight (e.g. ``fuel_level``, ``emergency``, ``eta``)."""
+        self._flights[flight_id] = dict(self._flights[flight_id], **changes)
+        key = self._key(flight_id)
+
+        if flight_id in self._plan_index:
+            index = self._plan_index[flight_id]
+            self._rollback(min(index, bisect_left(self._plan_keys, key)))
+        else:
+            self._invalidate_from(key)
+        if self._backlog_entry.pop(flight_id, None) is not None:
+            self._queue.push(flight_id, key)  # its backlog entry goes stale
+        else:
+            self._queue.update(flight_id, key)
+
+    def remove(self, flight_id):
+        if flight_id in self._plan_index:
+            self._rollback(self._plan_index[flight_id])
+        if self._backlog_entry.pop(flight_id, None) is None:
+            self._queue.remove(flight_id)
+        del self._flights[flight_id]
+        del self._arrival[flight_id]
+
+    def plan(self):
+        """Schedule every queued flight behind the current plan."""
+        queue, backlog, live = self._queue, self._backlog, self._backlog_entry
+        plan_ids, plan_keys, plan_index, checkpoints = self._plan_ids, self._plan_keys, self._plan_index, \
+            self._checkpoints
+        scheduler, flights = self.scheduler, self._flights
+        while backlog or queue:
+            # Merge the backlog with the queue, dropping backlog entries that went stale
+            if backlog:
+                entry = backlog[0]
+                if live.get(entry[1]) is not entry:
+                    backlog.popleft()
+                    continue
+                if queue and queue.peek()[1] < entry[0]:
+                    flight_id, key = queue.pop()
+                else:
+                    backlog.popleft()
+                    key, flight_id = entry
+                    del live[flight_id]
+            else:
+                flight_id, key = queue.pop()
+            position = len(plan_ids)
+            if position % CHECKPOINT_EVERY == 0:
+                checkpoints.append(scheduler.state())
+            plan_index[flight_id] = position
+            plan_ids.append(flight_id)
+            plan_keys.append(key)
+            scheduler.assign(flights[flight_id])
+        return scheduler.schedule[self._offset:]
@@ -0,0 +1,164 @@
+# runway_allocator/scheduler.py
+# Headless runway scheduling engine (no GUI, no module-level side effects)
+
+from priority_queue import IndexedPriorityQueue
+
+SIZE_RANK = {"Large": 3, "Medium": 2, "Small": 1}
+
+CONFLICT_BUFFER = 2   # frames between consecutive landings / after a landing
+LANDING_WAIT = 2      # frames an aircraft waits at the runway end
+
+
+_default_airport = None
+
+
+def default_airport():
+    """First airport in airports.json; its tables are the scheduler defaults."""
+    global _default_airport
+    if _default_airport is None:
+        from topology import load_topology  # loaded on first use: topology imports this module
+        _default_airport = load_topology()
+    return _default_airport
+
+
+def runway_conflicts(runways):
+    """runway -> other runways that share a node with it (crossing or overlapping runways)."""
+    node_sets = {key: set(nodes) for key, nodes in runways.items()}
+    return {key: [other for other in runways if other != key and not nodes.isdisjoint(node_sets[other])]
+            for key, nodes in node_sets.items()}
+
+
+def flight_priority(f):
+    return (
+        not f["emergency"],       # Emergency flights first
+        f["fuel_level"],          # Lower fuel level has higher priority
+        SIZE_RANK[f["type"]]      # Larger flights prioritized
+    )
+
+
+class RunwayScheduler:
+    """Assigns flights to runways one at a time, in the order they are given.
+
+    Every aircraft type keeps an indexed heap of the runways it may use,
+    keyed by ``(free_time, preference)``. When a runway's free time moves
+    on, its entry in each heap is updated in place, so a heap always holds
+    exactly its runways and picking the earliest available runway costs
+    O(log R) time and O(R) memory, however many flights are assigned.
+
+    Runways that share a node (``conflicts``, computed from ``runways`` by
+    default) are occupied together: a landing on one holds the others
+    until it is clear.
+
+    Without ``runways``/``preferred_runways`` the tables of
+    ``default_airport()`` are used. Eligibility is per aircraft type
+    (``preferred_runways``); a flight's own ``required_runway_length`` is
+    not read.
+
+    ``on_assign`` (optional) sees every log entry as it is appended.
+    """
+
+    on_assign = None
+
+    def __init__(self, runways=None, preferred_runways=None, traversal_times=None, conflicts=None):
+        if runways is None or preferred_runways is None:
+            airport = default_airport()
+            runways = runways if runways is not None else airport.runways
+            preferred_runways = preferred_runways if preferred_runways is not None else airport.preferred_runways
+        self.runways = runways
+        self.preferred_runways = preferred_runways
+        self.traversal_times = traversal_times if traversal_times is not None else \
+            {key: len(nodes) for key, nodes in self.runways.items()}
+        self.conflicts = conflicts if conflicts is not None else runway_conflicts(self.runways)
+
+        # runway -> [(aircraft type, preference rank)]
+        self._runway_types = {key: [] for key in self.runways}
+        for ac_type, keys in self.preferred_runways.items():
+            for rank, key in enumerate(keys):
+                self._runway_types[key].append((ac_type, rank))
+
+        self.reset()
+
+    @classmethod
+    def from_topology(cls, topology):
+        """Scheduler over an ``AirportTopology`` using its precomputed tables."""
+        return cls(topology.runways, topology.preferred_runways, topology.traversal_times, topology.conflicts)
+
+    def reset(self, free_times=None, assigned=0):
+        """Start over, optionally from saved runway free times."""
+        self.schedule = []
+        self.log_entries = []
+        self._restore(free_times, assigned)
+
+    def rollback(self, state, keep):
+        """Return to a ``state()`` snapshot, keeping the first ``keep`` schedule entries."""
+        del self.schedule[keep:]
+        del self.log_entries[keep:]
+        self._restore(*state)
+
+    def _restore(self, free_times, assigned):
+        self.runway_next_free_time = {key: 0 for key in self.runways}
+        if free_times:
+            self.runway_next_free_time.update(free_times)
+        self.assigned = assigned
+
+        self._heaps = {ac_type: IndexedPriorityQueue() for ac_type in self.preferred_runways}
+        for key, free_time in self.runway_next_free_time.items():
+            for ac_type, rank in self._runway_types[key]:
+                self._heaps[ac_type].push(key, (free_time, rank))
+
+    def state(self):
+        """Snapshot that can be handed back to ``reset`` to resume from here."""
+        return dict(self.runway_next_free_time), self.assigned
+
+    def _earliest_runway(self, ac_type):
+        heap = self._heaps.get(ac_type)
+        if not heap:
+            raise KeyError(f"No runway can take a {ac_type} aircraft")
+        return heap.peek()[0]
+
+    def _set_free_time(self, key, free_time):
+        for runway in (key, *self.conflicts[key]):
+            if runway != key and self.runway_next_free_time[runway] >= free_time:
+                continue  # a crossing runway already busy for longer
+            self.runway_next_free_time[runway] = free_time
+            for ac_type, rank in self._runway_types[runway]:
+                self._heaps[ac_type].update(runway, (free_time, rank))
+
+    def assign(self, flight):
+        """Assign a single flight and return its schedule entry."""
+        runway_key = self._earliest_runway(flight["type"])
+        runway = self.runways[runway_key]
+
+        # Apply conflict buffer after previous flight
+        start_time = max(self.runway_next_free_time[runway_key], self.assigned * CONFLICT_BUFFER)
+        end_time = start_time + self.traversal_times[runway_key] + LANDING_WAIT  # traversal + wait
+
+        self._set_free_time(runway_key, end_time + CONFLICT_BUFFER)  # buffer after landing
+        self.assigned += 1
+
+        entry = {
+            "flight": flight,
+            "runway": runway,
+            "start": start_time,
+            "end": end_time
+        }
+        self.schedule.append(entry)
+        self.log_entries.append({
+            "Flight ID": flight["id"],
+            "Type": flight["type"],
+            "Emergency": flight["emergency"],
+            "Fuel Level": flight["fuel_level"],
+            "ETA": flight["eta"],
+            "Assigned Runway": runway_key,
+            "Start Time": start_time,
+            "End Time": end_time
+        })
+        if self.on_assign is not None:
+            self.on_assign(self.log_entries[-1])
+        return entry
+
+    def assign_batch(self, flights, presorted=False):
+        """Assign a batch of flights, sorting them by priority unless presorted."""
+        if not presorted:
+            flights = sorted(flights, key=flight_priority)
+        return [self.assign(flight) for flight in flights]
@@ -0,0 +1,126 @@
+# runway_allocator/table_view.py
+# Virtualized Tkinter table + background CSV/Parquet export
+
+import os
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import ttk
+
+_root = None
+_export_pool = None
+
+
+class LazyTable:
+    """Treeview that only holds the rows currently on screen.
+
+    The scrollbar drives an offset into the DataFrame; scrolling rewrites
+    the values of a fixed set of Treeview items instead of inserting one
+    item per row up front.
+    """
+
+    def __init__(self, master, dataframe, visible_rows=12):
+        self.dataframe = dataframe
+        self.visible_rows = visible_rows
+        self.offset = 0
+
+        frame = ttk.Frame(master)
+        frame.pack(fill=tk.BOTH, expand=True)
+
+        self.tree = ttk.Treeview(frame, columns=list(dataframe.columns), show="headings", height=visible_rows)
+        for col in dataframe.columns:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=100)
+        self._items = [self.tree.insert("", "end", values=()) for _ in range(min(visible_rows, len(dataframe)))]
+
+        self.scrollbar = ttk.Scrollbar(frame, orient="vertical", command=self._on_scroll)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.status = ttk.Label(master)
+        self.status.pack(fill=tk.X)
+
+        # Wheel delta is 120 per notch on Windows but 1-2 on macOS: only its sign is portable.
+        # X11 Tk reports the wheel as buttons 4 and 5 instead.
+        self.tree.bind("<MouseWheel>", lambda e: self.scroll_to(self.offset + (-1 if e.delta > 0 else 1)))
+        self.tree.bind("<Button-4>", lambda e: self.scroll_to(self.offset - 1))
+        self.tree.bind("<Button-5>", lambda e: self.scroll_to(self.offset + 1))
+        self.tree.bind("<Prior>", lambda e: self.scroll_to(self.offset - self.visible_rows))
+        self.tree.bind("<Next>", lambda e: self.scroll_to(self.offset + self.visible_rows))
+
+        self.scroll_to(0)
+
+    def _on_scroll(self, action, value, unit=None):
+        if action == "moveto":
+            self.scroll_to(int(float(value) * len(self.dataframe)))
+        elif action == "scroll":
+            step = self.visible_rows if unit == "pages" else 1
+            self.scroll_to(self.offset + int(value) * step)
+
+    def scroll_to(self, offset):
+        total = len(self.dataframe)
+        self.offset = max(0, min(offset, total - len(self._items)))
+        rows = self.dataframe.iloc[self.offset:self.offset + len(self._items)].itertuples(index=False)
+        for item, row in zip(self._items, rows):
+            self.tree.item(item, values=list(row))
+
+        if total:
+            self.scrollbar.set(self.offset / total, (self.offset + len(self._items)) / total)
+            self.status.configure(text=f"Rows {self.offset + 1}-{self.offset + len(self._items)} of {total}")
+        else:
+            self.status.configure(text="No rows")
+
+
+def show_table(title, dataframe, block=True, visible_rows=12):
+    """Open a table window. With ``block=False`` it returns at once; the
+    window is served by the next blocking ``show_table`` or ``run_tables``."""
+    global _root
+    if _root is None:
+        _root = tk.Tk()
+        _root.withdraw()
+
+    window = tk.Toplevel(_root)
+    window.title(title)
+    window.geometry("800x300")
+    window.protocol("WM_DELETE_WINDOW", lambda: _close(window))
+    LazyTable(window, dataframe, visible_rows)
+
+    if block:
+        run_tables()
+    return window
+
+
+def _close(window):
+    window.destroy()
+    if _root is not None and not _root.winfo_children():
+        _root.quit()
+
+
+def run_tables():
+    """Run the Tk event loop until every table window is closed."""
+    global _root
+    if _root is None:
+        return
+    if _root.winfo_children():
+        _root.mainloop()
+    _root.destroy()
+    _root = None
+
+
+def export_table(dataframe, path):
+    """Write a table to CSV or Parquet (picked from the file extension)."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        dataframe.to_csv(path, index=False)
+    elif ext in (".parquet", ".pq"):
+        dataframe.to_parquet(path, index=False)
+    else:
+        raise ValueError(f"Unsupported table format: {ext or path}")
+    return path
+
+
+def export_table_async(dataframe, path):
+    """Export on a background thread; returns a Future resolving to the path."""
+    global _export_pool
+    if _export_pool is None:
+        _export_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="table-export")
+    return _export_pool.submit(export_table, dataframe, path)
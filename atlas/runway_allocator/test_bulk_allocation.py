@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+
+from benchmark import generate_flights
+from bulk_allocation import allocate_bulk, bulk_log_entries
+from scheduler import RunwayScheduler, flight_priority
+from topology import load_airports
+
+def scalar_log(flights, *tables):
+    scheduler = RunwayScheduler(*tables)
+    scheduler.assign_batch(sorted(flights, key=flight_priority), presorted=True)
+    return scheduler.log_entries
+
+
+def plain(records):
+    return [{k: v.item() if isinstance(v, np.generic) else v for k, v in r.items()} for r in records]
+
+
+def test_bulk_matches_scalar_on_random_flights():
+    for seed in range(5):
+        flights = generate_flights(2000, seed, emergency_rate=0.05)
+        assert plain(bulk_log_entries(flights)) == scalar_log(flights)
+
+
+def test_bulk_matches_scalar_on_every_airport():
+    for seed, (name, topology) in enumerate(load_airports().items()):
+        tables = (topology.runways, topology.preferred_runways, topology.traversal_times, topology.conflicts)
+        flights = generate_flights(1000, seed, emergency_rate=0.05)
+        assert plain(bulk_log_entries(flights, *tables)) == scalar_log(flights, *tables), name
+
+
+def test_bulk_accepts_a_dataframe():
+    flights = generate_flights(300, 42, emergency_rate=0.05)
+    assert plain(allocate_bulk(pd.DataFrame(flights)).to_dict("records")) == scalar_log(flights)
@@ -0,0 +1,64 @@
+import random
+import time
+
+from benchmark import generate_flights
+from resequencer import Resequencer
+from scheduler import RunwayScheduler, flight_priority
+
+def rebuild(flights):
+    """Reference: re-sort everything and schedule from scratch."""
+    scheduler = RunwayScheduler()
+    scheduler.assign_batch(sorted(flights, key=flight_priority), presorted=True)
+    return scheduler.log_entries
+
+
+def test_resequencer_matches_a_full_rebuild():
+    rng = random.Random(2)
+    resequencer = Resequencer()
+    arrivals = iter(generate_flights(600, seed=2, emergency_rate=0.05))
+    flights = {}  # arrival order, as the rebuild sees it
+    for step in range(600):
+        op = rng.random()
+        if op < 0.4 or not flights:
+            flight = next(arrivals)
+            flights[flight["id"]] = flight
+            resequencer.add(flight)
+        elif op < 0.85:
+            flight_id = rng.choice(list(flights))
+            changes = rng.choice([{"fuel_level": rng.randrange(10, 100)}, {"emergency": True},
+                                  {"eta": f"13:{rng.randrange(60):02d}"}])
+            flights[flight_id] = dict(flights[flight_id], **changes)
+            resequencer.update(flight_id, **changes)
+        else:
+            flight_id = rng.choice(list(flights))
+            del flights[flight_id]
+            resequencer.remove(flight_id)
+        if step % 7 == 0:  # let edits pile up between plans too
+            assert resequencer.log_entries == rebuild(flights.values())
+    assert resequencer.log_entries == rebuild(flights.values())
+
+
+def _seconds(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def test_emergency_update_is_no_slower_than_a_rebuild():
+    flights = generate_flights(5000, seed=2, emergency_rate=0)
+    resequencer = Resequencer()
+    resequencer.add_batch(flights)
+    resequencer.plan()
+    ids = iter(range(1, len(flights) + 1))
+
+    def emergency():  # moves a flight to the front: the whole plan behind it is re-planned
+        resequencer.update(next(ids), emergency=True)
+        resequencer.plan()
+
+    # Interleaved, best of 7: the least noisy comparison on a shared machine
+    incremental, full = [], []
+    for _ in range(7):
+        full.append(_seconds(lambda: rebuild(flights)))
+        incremental.append(_seconds(emergency))
+    # The old heap-based replan took over 3x a rebuild
+    assert min(incremental) < 1.5 * min(full)
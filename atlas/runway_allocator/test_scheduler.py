@@ -0,0 +1,20 @@
+import pytest
+
+from bulk_allocation import allocate_bulk
+from scheduler import RunwayScheduler, default_airport
+
+
+def test_runway_heaps_stay_the_size_of_their_runway_lists():
+    scheduler = RunwayScheduler()
+    for i in range(20000):
+        scheduler.assign({"id": i, "type": "Small", "eta": "12:00", "fuel_level": 50, "emergency": False})
+    assert {ac_type: len(heap) for ac_type, heap in scheduler._heaps.items()} == \
+        {ac_type: len(keys) for ac_type, keys in default_airport().preferred_runways.items()}
+
+
+def test_unknown_type_raises_key_error_in_both_paths():
+    flight = {"id": 1, "type": "Jumbo", "eta": "12:00", "fuel_level": 50, "emergency": False}
+    with pytest.raises(KeyError):
+        RunwayScheduler().assign(flight)
+    with pytest.raises(KeyError):
+        allocate_bulk([flight], preferred_runways=dict(default_airport().preferred_runways, Jumbo=[]))
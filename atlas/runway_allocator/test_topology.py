@@ -0,0 +1,21 @@
+import random
+
+from scheduler import RunwayScheduler
+from topology import load_airports
+
+
+def test_crossing_runways_are_never_occupied_at_once():
+    topology = load_airports()["DEMO_CROSSING"]
+    assert topology.conflicts == {"runway_09": ["runway_18"], "runway_18": ["runway_09"]}
+    rng = random.Random(6)
+    scheduler = RunwayScheduler.from_topology(topology)
+    for i in range(200):
+        scheduler.assign({"id": i, "type": rng.choice(["Small", "Medium", "Large"]), "eta": "12:00",
+                          "fuel_level": rng.randrange(100), "emergency": False})
+    busy = sorted((e["Start Time"], e["End Time"]) for e in scheduler.log_entries)
+    assert all(end <= next_start for (_, end), (next_start, _) in zip(busy, busy[1:]))
+    assert {e["Assigned Runway"] for e in scheduler.log_entries} == {"runway_09", "runway_18"}
+
+
+def test_disjoint_runways_have_no_conflicts():
+    assert all(not others for others in load_airports()["ATLAS"].conflicts.values())
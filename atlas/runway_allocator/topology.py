@@ -0,0 +1,109 @@
+# runway_allocator/topology.py
+# Airport runway/taxiway topology loaded from a data file, with precomputed lookup tables
+
+import json
+import os
+
+import networkx as nx
+
+from scheduler import runway_conflicts
+
+DEFAULT_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "airports.json")
+
+
+class AirportTopology:
+    """Runway graph plus the lookup tables the scheduler needs.
+
+    Everything that needs the graph is computed once here:
+
+    - ``preferred_runways``: aircraft type -> runways whose length covers the
+      type's ``required_runway_length``, shortest adequate runway first
+    - ``traversal_times``: runway -> frames to roll out along the runway
+    - ``conflicts``: runway -> runways sharing a node with it (intersections),
+      which the scheduler occupies together
+    - ``taxi_routes`` / ``taxi_times``: runway exit -> apron shortest path
+    """
+
+    def __init__(self, name, config, aircraft_types):
+        self.name = name
+        self.aircraft_types = aircraft_types
+        self.graph = nx.DiGraph()
+        self.runways = {}
+        self.runway_lengths = {}
+        self.pos = {}
+
+        for row, (key, runway) in enumerate(config["runways"].items()):
+            nodes = list(runway["nodes"])
+            self.runways[key] = nodes
+            self.runway_lengths[key] = runway.get("length", len(nodes))
+            y = runway.get("row", len(config["runways"]) - 1 - row)
+            for i, node in enumerate(nodes):
+                self.graph.add_node(node)
+                self.pos.setdefault(node, (i, y))
+            for a, b in zip(nodes, nodes[1:]):
+                self.graph.add_edge(a, b, time=1, runway=key)
+
+        for taxiway in config.get("taxiways", []):
+            a, b, time = taxiway["from"], taxiway["to"], taxiway.get("time", 1)
+            self.graph.add_edge(a, b, time=time, taxiway=True)
+            if not taxiway.get("oneway", False):
+                self.graph.add_edge(b, a, time=time, taxiway=True)
+
+        for node, xy in config.get("positions", {}).items():
+            self.pos[_node_id(node, self.graph)] = tuple(xy)
+
+        self.apron = config.get("apron")
+        self._precompute()
+
+    def _precompute(self):
+        order = list(self.runways)
+        self.preferred_runways = {}
+        for ac_type, spec in self.aircraft_types.items():
+            eligible = [key for key in order if self.runway_lengths[key] >= spec["required_runway_length"]]
+            eligible.sort(key=lambda key: (self.runway_lengths[key], order.index(key)))
+            self.preferred_runways[ac_type] = eligible
+
+        self.traversal_times = {key: len(nodes) for key, nodes in self.runways.items()}
+        self.conflicts = runway_conflicts(self.runways)
+
+        self.taxi_routes, self.taxi_times = {}, {}
+        if self.apron is not None:
+            for key, nodes in self.runways.items():
+                try:
+                    time, route = nx.single_source_dijkstra(self.graph, nodes[-1], self.apron, weight="time")
+                except nx.NetworkXNoPath:
+                    continue
+                self.taxi_routes[key] = route
+                self.taxi_times[key] = time
+
+
+def _node_id(node, graph):
+    # JSON object keys are always strings; map "3" back to node 3 when needed
+    if node not in graph and node.lstrip("-").isdigit() and int(node) in graph:
+        return int(node)
+    return node
+
+
+def load_aircraft_types(path=DEFAULT_CONFIG):
+    """Aircraft type -> spec (``required_runway_length``) from the data file."""
+    with open(path) as f:
+        return json.load(f)["aircraft_types"]
+
+
+def load_airports(path=DEFAULT_CONFIG):
+    """name -> AirportTopology for every airport in the data file."""
+    with open(path) as f:
+        config = json.load(f)
+    aircraft_types = config["aircraft_types"]
+    return {name: AirportTopology(name, airport, aircraft_types)
+            for name, airport in config["airports"].items()}
+
+
+def load_topology(path=DEFAULT_CONFIG, airport=None):
+    """A single airport; defaults to the first one in the file."""
+    airports = load_airports(path)
+    if airport is None:
+        return next(iter(airports.values()))
+    if airport not in airports:
+        raise KeyError(f"Unknown airport {airport!r}; available: {', '.join(airports)}")
+    return airports[airport]